@@ -1,22 +1,105 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from flask import Flask, jsonify, request, send_from_directory, session
+import click
+from flask import (Flask, Response, g, has_app_context, has_request_context, jsonify, request,
+                   send_from_directory, session, stream_with_context)
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_session import Session
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from limits.storage import MovingWindowSupport, Storage
+from flask.sessions import SecureCookieSessionInterface, SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
 from werkzeug.security import generate_password_hash, check_password_hash
 import os
+import atexit
+import base64
+import contextvars
+import csv
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import random
+import re
 import secrets
+import select
+import sqlite3
+import tempfile
 import logging
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from functools import wraps
+from urllib.parse import urlencode, urlparse
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from operator import itemgetter
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
 
-app = Flask(__name__, static_folder='static', static_url_path='')
+try:
+    import brotli
+except ImportError:  # opcional: sem ele os estáticos têm só a variante gzip
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # opcional: sem ele o JSON usa o encoder da stdlib
+    orjson = None
+
+# Encoder JSON das respostas: orjson (se instalado) ou stdlib
+JSON_BACKEND = os.environ.get('JSON_BACKEND', 'orjson' if orjson else 'stdlib')
+
+
+class AppJSONProvider(DefaultJSONProvider):
+    """JSON da API: datas em ISO 8601, UTF-8 sem escapes, chaves na ordem da query.
+
+    Handlers devolvem as linhas do banco como estão; datetime/date são
+    convertidos aqui, no encoder.
+    """
+
+    ensure_ascii = False
+    sort_keys = False
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps_bytes(self, obj):
+        """Serializa direto para bytes compactos (sem passar por str com orjson)"""
+        if JSON_BACKEND == 'orjson':
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return super().dumps(obj, separators=(',', ':')).encode()
+
+    def dumps(self, obj, **kwargs):
+        if JSON_BACKEND == 'orjson' and not kwargs:
+            return self.dumps_bytes(obj).decode()
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if JSON_BACKEND == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+
+# Estáticos do frontend são servidos por serve_frontend (manifesto em memória)
+app = Flask(__name__, static_folder=None)
+app.json = AppJSONProvider(app)
 
 # ========================================
 # SEGURANÇA
@@ -41,22 +124,23 @@ CORS(app,
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', secrets.token_hex(16))
 if IS_PRODUCTION and not os.environ.get('SECRET_KEY'):
     logging.warning("ATENÇÃO: SECRET_KEY não definida! Sessões serão invalidadas a cada restart.")
-app.config['SESSION_TYPE'] = 'filesystem'
-app.config['SESSION_FILE_DIR'] = './flask_session'
 app.config['SESSION_PERMANENT'] = False
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['SESSION_COOKIE_SECURE'] = IS_PRODUCTION  # True em produção (HTTPS)
 app.config['SESSION_COOKIE_HTTPONLY'] = True
-Session(app)
-
-# Rate limiter
-limiter = Limiter(
-    get_remote_address,
-    app=app,
-    default_limits=["200 per hour"],
-    storage_uri="memory://",
-)
 
+# Backend de sessão: postgres (tabela http_sessions, padrão), filesystem ou cookie.
+# No cookie (assinado) a sessão vive no cliente: logout não a revoga no servidor e
+# ela continua válida até expirar (SESSION_LIFETIME_HOURS)
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'postgres')
+SESSION_LIFETIME = timedelta(hours=float(os.environ.get('SESSION_LIFETIME_HOURS', 24)))
+app.permanent_session_lifetime = SESSION_LIFETIME
+# Por quanto tempo (s) os dados do usuário ficam cacheados na sessão
+USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', 300))
+if SESSION_BACKEND == 'filesystem':
+    app.config['SESSION_TYPE'] = 'filesystem'
+    app.config['SESSION_FILE_DIR'] = './flask_session'
+    Session(app)
 
 # Proteção CSRF: valida Origin em requisições que modificam estado
 @app.before_request
@@ -90,77 +174,1758 @@ if os.getenv('FLASK_ENV') == 'production':
 else:
     STATIC_PATH = Path(__file__).parent.parent.parent
 
+# Cache-Control dos estáticos: assets com hash no nome são imutáveis; o index.html
+# tem vida curta para que um deploy novo apareça logo
+STATIC_IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+STATIC_CACHE_CONTROL = os.environ.get('STATIC_CACHE_CONTROL', 'public, max-age=3600')
+STATIC_INDEX_CACHE_CONTROL = os.environ.get('STATIC_INDEX_CACHE_CONTROL', 'public, max-age=60')
+# Arquivos maiores que isso não ficam em memória (são lidos do disco a cada requisição)
+STATIC_MAX_INLINE_BYTES = int(os.environ.get('STATIC_MAX_INLINE_BYTES', 1024 * 1024))
+
+# Compressão das respostas dinâmicas (gzip, ou brotli se o módulo estiver instalado)
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+COMPRESS_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 6))
+COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
+COMPRESS_MIMETYPES = set(os.environ.get(
+    'COMPRESS_MIMETYPES',
+    'application/json,text/html,text/plain,text/csv,text/css,application/javascript,image/svg+xml'
+).split(','))
+
+# Migrações de schema versionadas (NNNN_descricao.sql)
+MIGRATIONS_PATH = Path(__file__).parent / 'migrations'
+DB_AUTO_MIGRATE = os.environ.get('DB_AUTO_MIGRATE', '1') == '1'
+
+# Exportação NDJSON: linhas buscadas por lote no cursor nomeado
+EXPORT_ITERSIZE = int(os.environ.get('EXPORT_ITERSIZE', 500))
+
+# Intervalo (s) de atualização periódica de content_stats; 0 = só após escritas
+STATS_REFRESH_INTERVAL = float(os.environ.get('STATS_REFRESH_INTERVAL', 300))
+
+# Cache de respostas em memória (por worker)
+RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', 60))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+# Versões de conteúdo (ETags) guardadas por worker; inclui as chaves user:<id>
+CONTENT_VERSIONS_MAX_ENTRIES = int(os.environ.get('CONTENT_VERSIONS_MAX_ENTRIES', 4096))
+
+# Cache compartilhado entre workers (SQLite em memória compartilhada); vazio desativa
+_default_shared_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+SHARED_CACHE_PATH = os.environ.get('SHARED_CACHE_PATH', os.path.join(_default_shared_dir, 'amparo-cache.sqlite3'))
+SHARED_CACHE_MAX_ENTRIES = int(os.environ.get('SHARED_CACHE_MAX_ENTRIES', 4096))
+# Canal LISTEN/NOTIFY que propaga invalidações para todos os workers
+CACHE_NOTIFY_CHANNEL = os.environ.get('CACHE_NOTIFY_CHANNEL', 'amparo_cache')
+
+# Cache-Control das rotas públicas: padrão + overrides por endpoint em JSON,
+# ex.: CACHE_CONTROL_ROUTES='{"get_stats": "public, max-age=60"}'
+CACHE_CONTROL_DEFAULT = os.environ.get('CACHE_CONTROL_DEFAULT', 'public, no-cache')
+CACHE_CONTROL_ROUTES = json.loads(os.environ.get('CACHE_CONTROL_ROUTES') or '{}')
+
+# Métricas Prometheus: cada worker grava um snapshot aqui a cada METRICS_FLUSH_INTERVAL
+# segundos e /metrics soma todos; vazio = só o worker que atende. METRICS_TOKEN protege /metrics
+METRICS_PATH = os.environ.get('METRICS_PATH', os.path.join(_default_shared_dir, 'amparo-metrics.sqlite3'))
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+# Gauges de snapshots sem atualização há mais que isso (s) saem da soma (contadores ficam)
+METRICS_SNAPSHOT_TTL = float(os.environ.get('METRICS_SNAPSHOT_TTL', max(300, 10 * METRICS_FLUSH_INTERVAL)))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Storage do rate limiter, compartilhado entre workers: amparo+sqlite://<caminho>
+# (mesmo host), amparo+postgres:// (tabela rate_limits) ou memory:// (por worker)
+LIMITER_STORAGE_URI = os.environ.get(
+    'LIMITER_STORAGE_URI', 'amparo+sqlite://' + os.path.join(_default_shared_dir, 'amparo-limits.sqlite3')
+)
+LIMITER_STRATEGY = os.environ.get('LIMITER_STRATEGY', 'moving-window')
+# RATELIMIT_ENABLED=0 desliga o rate limit (benchmarks de carga)
+app.config['RATELIMIT_ENABLED'] = os.environ.get('RATELIMIT_ENABLED', '1') == '1'
+
+# Pool de conexões (um por worker do Gunicorn)
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', 5))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+DB_POOL_MAX_LIFETIME = float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800))
+DB_POOL_PING_AFTER = float(os.environ.get('DB_POOL_PING_AFTER', 30))
+# Instrumentação: queries acima disso (ms) vão para o log amparo.slow_query;
+# Server-Timing: off, summary (tempos agregados) ou full (inclui as queries mais lentas)
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200))
+QUERY_STATS_TOP = int(os.environ.get('QUERY_STATS_TOP', 3))
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'summary' if IS_PRODUCTION else 'full')
+
+# Queries independentes de um handler rodando em paralelo (conexões extras do pool); 1 desativa
+QUERY_PARALLELISM = int(os.environ.get('QUERY_PARALLELISM', 4))
+
+
+class PoolExhausted(Exception):
+    """Nenhuma conexão livre dentro de DB_POOL_TIMEOUT"""
+
+
+class ConnectionPool:
+    """Pool limitado de conexões PostgreSQL com health check e reciclagem"""
+
+    def __init__(self, config, maxconn, timeout, max_lifetime, ping_after):
+        self.config = config
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._idle = deque()  # (conn, criada_em, ultimo_uso)
+        self._born = {}
+        self._in_use = 0
+        self.stats = {
+            'checkouts': 0,
+            'connects': 0,
+            'recycled': 0,
+            'failed_pings': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'exhausted': 0,
+        }
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.config)
+        conn.autocommit = True
+        with self._lock:
+            self._born[id(conn)] = time.monotonic()
+            self.stats['connects'] += 1
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._born.pop(id(conn), None)
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def _expired(self, conn):
+        born = self._born.get(id(conn), 0)
+        return time.monotonic() - born > self.max_lifetime
+
+    def _healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.ping_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            with self._lock:
+                self.stats['failed_pings'] += 1
+            return False
+
+    def getconn(self, wait=True):
+        """Retira uma conexão do pool, esperando até `timeout` segundos.
+
+        Com wait=False retorna None imediatamente se o pool estiver cheio.
+        """
+        start = time.monotonic()
+        if not self._slots.acquire(blocking=False):
+            if not wait:
+                return None
+            with self._lock:
+                self.stats['waits'] += 1
+            if not self._slots.acquire(timeout=self.timeout):
+                with self._lock:
+                    self.stats['exhausted'] += 1
+                raise PoolExhausted(f"pool esgotado ({self.maxconn} conexões em uso)")
+        waited = time.monotonic() - start
+        with self._lock:
+            self.stats['wait_time_total'] += waited
+            self.stats['wait_time_max'] = max(self.stats['wait_time_max'], waited)
+
+        try:
+            while True:
+                with self._lock:
+                    item = self._idle.pop() if self._idle else None
+                if item is None:
+                    conn = self._connect()
+                    break
+                conn, last_used = item
+                if self._expired(conn):
+                    with self._lock:
+                        self.stats['recycled'] += 1
+                    self._discard(conn)
+                    continue
+                if not self._healthy(conn, last_used):
+                    self._discard(conn)
+                    continue
+                break
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self.stats['checkouts'] += 1
+        return conn
+
+    def putconn(self, conn):
+        """Devolve a conexão ao pool (ou descarta se estiver quebrada/expirada)"""
+        try:
+            if conn.closed or self._expired(conn):
+                self._discard(conn)
+                return
+            try:
+                status = conn.get_transaction_status()
+                if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                self._discard(conn)
+                return
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def snapshot(self):
+        """Métricas atuais do pool"""
+        with self._lock:
+            data = dict(self.stats)
+            data['in_use'] = self._in_use
+            data['idle'] = len(self._idle)
+        data['max'] = self.maxconn
+        return data
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Retorna o pool do processo atual (recriado após fork)"""
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool(DB_CONFIG, DB_POOL_MAX, DB_POOL_TIMEOUT,
+                                       DB_POOL_MAX_LIFETIME, DB_POOL_PING_AFTER)
+                _pool_pid = os.getpid()
+    return _pool
+
 
 def get_db():
-    """Retorna uma conexão ao PostgreSQL"""
-    conn = psycopg2.connect(**DB_CONFIG)
-    conn.autocommit = True
-    return conn
+    """Retorna a conexão da requisição atual (retirada do pool uma única vez)"""
+    if 'db_conn' not in g:
+        start = time.perf_counter()
+        g.db_conn = get_pool().getconn()
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.acquire_time += time.perf_counter() - start
+    return g.db_conn
 
 
-def query_all(sql, params=None):
-    """Executa query e retorna lista de dicts"""
-    conn = get_db()
+@app.teardown_appcontext
+def release_db(exc):
+    """Devolve a conexão da requisição ao pool"""
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        get_pool().putconn(conn)
+
+
+@app.errorhandler(PoolExhausted)
+def handle_pool_exhausted(e):
+    logging.warning("Pool de conexões esgotado: %s", e)
+    return jsonify({'error': 'Serviço temporariamente indisponível'}), 503
+
+
+# ========================================
+# INSTRUMENTAÇÃO DE QUERIES
+# ========================================
+
+slow_query_log = logging.getLogger('amparo.slow_query')
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """SQL numa linha, com literais trocados por ? (agrupa queries iguais com valores diferentes)"""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+\b', '?', sql)
+    return ' '.join(sql.split())
+
+
+class QueryStats:
+    """Queries de uma requisição: contagem, tempo total, espera pelo pool e as mais lentas"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.db_time = 0.0
+        self.acquire_time = 0.0
+        self.slowest = []  # (segundos, sql normalizado), no máximo QUERY_STATS_TOP
+        self._lock = threading.Lock()
+
+    def add(self, sql, elapsed):
+        with self._lock:
+            self.count += 1
+            self.db_time += elapsed
+            if len(self.slowest) < QUERY_STATS_TOP or elapsed > self.slowest[-1][0]:
+                self.slowest.append((elapsed, sql))
+                self.slowest.sort(key=lambda item: item[0], reverse=True)
+                del self.slowest[QUERY_STATS_TOP:]
+
+
+# ContextVar (e não g) para que as threads de run_concurrently registrem na mesma requisição
+current_query_stats = contextvars.ContextVar('current_query_stats', default=None)
+
+
+@contextmanager
+def timed_query(sql):
+    """Mede o bloco como uma execução de `sql` (QueryStats e log de queries lentas)"""
+    start = time.perf_counter()
     try:
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.add(sql, elapsed)
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            slow_query_log.warning(json.dumps({
+                'event': 'slow_query',
+                'ms': round(elapsed * 1000, 1),
+                'sql': normalize_sql(sql),
+                'endpoint': request.endpoint if has_request_context() else None,
+                'path': request.path if has_request_context() else None,
+            }, ensure_ascii=False))
+
+
+def timed_execute(cur, sql, params=None):
+    """cur.execute com registro em QueryStats e no log de queries lentas"""
+    with timed_query(sql):
         cur.execute(sql, params or ())
+
+
+class QueryStatsMiddleware:
+    """Abre o QueryStats da requisição antes do contexto do Flask, para que as
+    queries de open_session (sessões no postgres) também sejam contadas"""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        token = current_query_stats.set(QueryStats())
+        try:
+            return self.wsgi_app(environ, start_response)
+        finally:
+            current_query_stats.reset(token)
+
+
+app.wsgi_app = QueryStatsMiddleware(app.wsgi_app)
+
+
+@app.after_request
+def add_server_timing(response):
+    """Server-Timing: db (tempo e nº de queries), db-acquire, app e, no modo full, as queries mais lentas"""
+    stats = current_query_stats.get()
+    if stats is None or SERVER_TIMING == 'off':
+        return response
+    total = time.perf_counter() - stats.started
+    metrics = [
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.count} queries"',
+        f'db-acquire;dur={stats.acquire_time * 1000:.1f}',
+        f'app;dur={total * 1000:.1f}',
+    ]
+    if SERVER_TIMING == 'full':
+        for n, (elapsed, sql) in enumerate(stats.slowest, 1):
+            desc = normalize_sql(sql)[:120].replace('\\', '').replace('"', "'")
+            metrics.append(f'sql-{n};dur={elapsed * 1000:.1f};desc="{desc}"')
+    response.headers.add('Server-Timing', ', '.join(metrics))
+    return response
+
+
+def query_all(sql, params=None, conn=None):
+    """Executa query e retorna lista de dicts"""
+    with (conn or get_db()).cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        timed_execute(cur, sql, params)
         rows = cur.fetchall()
         return [dict(r) for r in rows]
-    finally:
-        conn.close()
 
 
-def query_one(sql, params=None):
+def query_one(sql, params=None, conn=None):
     """Executa query e retorna um dict ou None"""
-    conn = get_db()
-    try:
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        cur.execute(sql, params or ())
+    with (conn or get_db()).cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        timed_execute(cur, sql, params)
         row = cur.fetchone()
         return dict(row) if row else None
-    finally:
-        conn.close()
 
 
-def query_scalar(sql, params=None):
+def query_scalar(sql, params=None, conn=None):
     """Executa query e retorna valor escalar"""
-    conn = get_db()
-    try:
-        cur = conn.cursor()
-        cur.execute(sql, params or ())
+    with (conn or get_db()).cursor() as cur:
+        timed_execute(cur, sql, params)
         row = cur.fetchone()
         return row[0] if row else None
+
+
+_query_executor = None
+_query_executor_pid = None
+
+
+def get_query_executor():
+    """Threads para queries paralelas do processo atual (recriadas após fork)"""
+    global _query_executor, _query_executor_pid
+    if _query_executor is None or _query_executor_pid != os.getpid():
+        with _pool_lock:
+            if _query_executor is None or _query_executor_pid != os.getpid():
+                _query_executor = ThreadPoolExecutor(QUERY_PARALLELISM, thread_name_prefix='query')
+                _query_executor_pid = os.getpid()
+    return _query_executor
+
+
+def _run_on_extra(pool, conn, fn, sql, params):
+    try:
+        return fn(sql, params, conn=conn)
     finally:
-        conn.close()
+        pool.putconn(conn)
+
+
+def run_concurrently(*queries):
+    """Executa queries independentes em paralelo e retorna os resultados na ordem.
+
+    Cada query é (função, sql, params) com função em query_all/query_one/query_scalar.
+    A primeira roda na conexão da requisição; as demais em conexões extras, só se
+    o pool tiver folga agora — senão rodam em sequência, sem nunca esperar o pool.
+    """
+    if QUERY_PARALLELISM <= 1 or len(queries) < 2 or g.get('in_transaction'):
+        return [fn(sql, params) for fn, sql, params in queries]
+
+    pool = get_pool()
+    get_db()
+    futures = []
+    for fn, sql, params in queries[1:]:
+        conn = pool.getconn(wait=False)
+        futures.append(None if conn is None else get_query_executor().submit(
+            contextvars.copy_context().run, _run_on_extra, pool, conn, fn, sql, params))
+
+    fn, sql, params = queries[0]
+    results = [fn(sql, params)]
+    for (fn, sql, params), future in zip(queries[1:], futures):
+        results.append(future.result() if future else fn(sql, params))
+    return results
 
 
 def execute(sql, params=None):
-    """Executa INSERT/UPDATE/DELETE"""
+    """Executa INSERT/UPDATE/DELETE; com RETURNING retorna a linha (None se nenhuma foi afetada)"""
+    with get_db().cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        timed_execute(cur, sql, params)
+        try:
+            row = cur.fetchone() if cur.description else None
+        except psycopg2.ProgrammingError:
+            return None
+        return dict(row) if row else None
+
+
+@contextmanager
+def transaction():
+    """Unit of work: todos os helpers chamados no bloco compartilham uma transação.
+
+    Faz commit ao sair normalmente e rollback se o bloco levantar exceção.
+    Blocos aninhados participam da transação externa.
+    """
     conn = get_db()
+    if g.get('in_transaction'):
+        yield conn
+        return
+    conn.autocommit = False
+    g.in_transaction = True
     try:
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        cur.execute(sql, params or ())
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        g.in_transaction = False
+        conn.autocommit = True
+
+
+def replace_children(table, column, parent_id, values):
+    """Substitui as linhas filhas (vídeos/arquivos) de um blog_blog num único round trip"""
+    execute(f"""
+        DELETE FROM {table} WHERE blog_post_id = %s;
+        INSERT INTO {table} ({column}, blog_post_id)
+        SELECT unnest(%s::varchar[]), %s
+    """, (parent_id, list(values), parent_id))
+
+
+# ========================================
+# SESSÕES
+# ========================================
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Sessão guardada no servidor; só o sid vai no cookie"""
+
+    def __init__(self, initial=None, sid=None, new=False, expires_at=None):
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires_at = expires_at
+        self.modified = False
+
+
+class PostgresSessionInterface(SessionInterface):
+    """Sessões na tabela http_sessions, usando a conexão da requisição.
+
+    Só grava quando a sessão muda ou quando falta menos da metade da validade,
+    e remove sessões expiradas em ~1% das gravações (ou via `flask sweep-sessions`).
+    """
+
+    sweep_probability = 0.01
+
+    def __init__(self, lifetime):
+        self.lifetime = lifetime
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            row = query_one(
+                "SELECT data, expires_at FROM http_sessions WHERE sid = %s AND expires_at > now()",
+                (sid,)
+            )
+            if row:
+                return ServerSession(row['data'], sid=sid, expires_at=row['expires_at'])
+        return ServerSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if not session:
+            if session.modified and not session.new:
+                execute("DELETE FROM http_sessions WHERE sid = %s", (session.sid,))
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = datetime.now(timezone.utc)
+        renew = session.expires_at is None or session.expires_at - now < self.lifetime / 2
+        if session.modified or renew:
+            expires_at = now + self.lifetime
+            execute("""
+                INSERT INTO http_sessions (sid, data, expires_at) VALUES (%s, %s, %s)
+                ON CONFLICT (sid) DO UPDATE SET data = EXCLUDED.data, expires_at = EXCLUDED.expires_at
+            """, (session.sid, json.dumps(dict(session)), expires_at))
+            if random.random() < self.sweep_probability:
+                sweep_sessions()
+
+        if session.new or session.modified or renew:
+            response.set_cookie(
+                name, session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain, path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app)
+            )
+
+
+def sweep_sessions():
+    """Remove sessões expiradas; retorna quantas foram removidas"""
+    with get_db().cursor() as cur:
+        timed_execute(cur, "DELETE FROM http_sessions WHERE expires_at <= now()")
+        return cur.rowcount
+
+
+if SESSION_BACKEND == 'postgres':
+    app.session_interface = PostgresSessionInterface(SESSION_LIFETIME)
+elif SESSION_BACKEND == 'cookie':
+    app.session_interface = SecureCookieSessionInterface()
+
+
+@app.cli.command('sweep-sessions')
+def sweep_sessions_command():
+    """Remove sessões expiradas de http_sessions"""
+    click.echo(f"Sessões removidas: {sweep_sessions()}")
+
+
+# ========================================
+# MIGRAÇÕES
+# ========================================
+
+# Chave arbitrária do advisory lock: evita que dois processos migrem ao mesmo tempo
+MIGRATION_LOCK_KEY = 7_210_001
+
+
+def list_migrations():
+    """Lista (versão, nome, caminho) das migrações em MIGRATIONS_PATH, em ordem"""
+    migrations = []
+    for path in sorted(MIGRATIONS_PATH.glob('*.sql')):
+        version, _, name = path.stem.partition('_')
+        if version.isdigit():
+            migrations.append((int(version), name, path))
+    return migrations
+
+
+def apply_migrations(dry_run=False):
+    """Aplica as migrações pendentes e registra em schema_migrations.
+
+    Cada arquivo roda na sua própria transação, exceto os que começam com
+    `-- migrate: no-transaction` (necessário para CREATE INDEX CONCURRENTLY).
+    Retorna a lista de versões aplicadas.
+    """
+    conn = psycopg2.connect(**DB_CONFIG)
+    conn.autocommit = True
+    applied_now = []
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version integer PRIMARY KEY,
+                    name text NOT NULL,
+                    checksum char(64) NOT NULL,
+                    applied_at timestamp with time zone DEFAULT now()
+                )
+            """)
+            cur.execute("SELECT version, checksum FROM schema_migrations")
+            applied = dict(cur.fetchall())
+
+        for version, name, path in list_migrations():
+            sql = path.read_text(encoding='utf-8')
+            checksum = hashlib.sha256(sql.encode()).hexdigest()
+            if version in applied:
+                if applied[version].strip() != checksum:
+                    logging.warning("Migração %04d_%s foi alterada depois de aplicada", version, name)
+                continue
+            if dry_run:
+                applied_now.append(version)
+                continue
+
+            logging.info("Aplicando migração %04d_%s", version, name)
+            no_transaction = sql.lstrip().startswith('-- migrate: no-transaction')
+            conn.autocommit = no_transaction
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(sql)
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                        (version, name, checksum)
+                    )
+                if not no_transaction:
+                    conn.commit()
+            except Exception:
+                if not no_transaction:
+                    conn.rollback()
+                raise
+            finally:
+                conn.autocommit = True
+            applied_now.append(version)
+    finally:
         try:
-            return dict(cur.fetchone()) if cur.description else None
-        except psycopg2.ProgrammingError:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+        finally:
+            conn.close()
+    return applied_now
+
+
+@app.cli.command('migrate')
+@click.option('--dry-run', is_flag=True, help='Apenas lista as migrações pendentes')
+def migrate_command(dry_run):
+    """Aplica as migrações de schema pendentes"""
+    versions = apply_migrations(dry_run=dry_run)
+    label = 'Pendentes' if dry_run else 'Aplicadas'
+    if versions:
+        click.echo(f"{label}: {', '.join(f'{v:04d}' for v in versions)}")
+    else:
+        click.echo("Nenhuma migração pendente")
+
+
+# ========================================
+# COMPRESSÃO
+# ========================================
+
+def negotiate_encoding(available):
+    """Escolhe a melhor codificação de `available` aceita pelo cliente (ou None)"""
+    best, best_quality = None, 0
+    for encoding in ('br', 'gzip'):
+        if encoding in available:
+            quality = request.accept_encodings[encoding]
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+    return best
+
+
+def compression_encoding(mimetype, size):
+    """Codificação a aplicar a um corpo deste tipo e tamanho, ou None"""
+    if size < COMPRESS_MIN_BYTES or mimetype not in COMPRESS_MIMETYPES:
+        return None
+    return negotiate_encoding(('br', 'gzip') if brotli else ('gzip',))
+
+
+def compress_bytes(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(body, COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+def apply_encoding(response, encoding, data):
+    """Troca o corpo pela versão comprimida; o ETag ganha o sufixo da codificação"""
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+
+
+@app.after_request
+def compress_response(response):
+    """Comprime respostas que não passaram pelo cache (as do @cached já vêm comprimidas)"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed or
+            'Content-Encoding' in response.headers):
+        return response
+    body = response.get_data()
+    encoding = compression_encoding(response.mimetype, len(body))
+    if encoding:
+        apply_encoding(response, encoding, compress_bytes(body, encoding))
+    return response
+
+
+# ========================================
+# CACHE DE RESPOSTAS
+# ========================================
+
+class CacheEntry:
+    __slots__ = ('body', 'status', 'mimetype', 'tags', 'expires', 'variants')
+
+    def __init__(self, body, status, mimetype, tags, expires):
+        self.body = body
+        self.status = status
+        self.mimetype = mimetype
+        self.tags = tags
+        self.expires = expires
+        self.variants = {}  # encoding -> corpo comprimido, preenchido sob demanda
+
+
+class ResponseCache:
+    """Cache LRU com TTL, limitado por número de entradas e bytes, invalidado por tag"""
+
+    def __init__(self, ttl, max_entries, max_bytes):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._by_tag = {}
+        self._generations = {}
+        self._bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'invalidations': 0}
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body) + sum(len(v) for v in entry.variants.values())
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+        return entry
+
+    def _evict(self, size, reserve_entry=False):
+        """Remove as entradas menos usadas até caber `size` bytes (e mais uma entrada)"""
+        while self._entries and ((reserve_entry and len(self._entries) >= self.max_entries) or
+                                 self._bytes + size > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.stats['evictions'] += 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+    def generation(self, tags):
+        """Marca de versão das tags; usada para não gravar resultados já invalidados"""
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def set(self, key, body, status, mimetype, tags, ttl=None, generation=None):
+        size = len(body)
+        if size > self.max_bytes // 4:
+            return
+        with self._lock:
+            if generation is not None and generation != tuple(self._generations.get(t, 0) for t in tags):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._evict(size, reserve_entry=True)
+            expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+            entry = self._entries[key] = CacheEntry(body, status, mimetype, tags, expires)
+            self._bytes += size
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            self.stats['stores'] += 1
+            return entry
+
+    def add_variant(self, key, entry, encoding, data):
+        """Guarda o corpo comprimido junto da entrada (se ela ainda estiver no cache)"""
+        with self._lock:
+            if self._entries.get(key) is entry and encoding not in entry.variants:
+                entry.variants[encoding] = data
+                self._bytes += len(data)
+                self._entries.move_to_end(key)
+                self._evict(0)
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in list(self._by_tag.pop(tag, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                self.stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+    def snapshot(self):
+        with self._lock:
+            data = dict(self.stats)
+            data['entries'] = len(self._entries)
+            data['bytes'] = self._bytes
+        lookups = data['hits'] + data['misses']
+        data['hit_ratio'] = round(data['hits'] / lookups, 4) if lookups else 0.0
+        return data
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES)
+
+
+def cache_key():
+    """Chave do cache: rota + query string normalizada (ordenada)"""
+    args = sorted(request.args.items(multi=True))
+    return f"{request.path}?{urlencode(args)}" if args else request.path
+
+
+class SharedCache:
+    """Camada de cache compartilhada entre os workers do mesmo host (SQLite em WAL).
+
+    Um worker frio busca aqui antes de ir ao banco. Tags são guardadas como
+    ',tag1,tag2,' para que a invalidação seja um único DELETE.
+    """
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._sets = 0
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'errors': 0}
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY, body BLOB, status INTEGER,
+                    mimetype TEXT, tags TEXT, expires REAL
+                )
+            """)
+            conn.execute("CREATE TABLE IF NOT EXISTS generations (tag TEXT PRIMARY KEY, gen INTEGER)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _generation(self, conn, tags):
+        gens = dict(conn.execute(
+            f"SELECT tag, gen FROM generations WHERE tag IN ({','.join('?' * len(tags))})", tags
+        ).fetchall()) if tags else {}
+        return tuple(gens.get(tag, 0) for tag in tags)
+
+    def get(self, key):
+        try:
+            row = self._conn().execute(
+                "SELECT body, status, mimetype, tags, expires FROM entries WHERE key = ? AND expires > ?",
+                (key, time.time())
+            ).fetchone()
+        except sqlite3.Error:
+            self.stats['errors'] += 1
             return None
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        body, status, mimetype, tags, expires = row
+        return CacheEntry(bytes(body), status, mimetype, tuple(t for t in tags.split(',') if t), expires)
+
+    def generation(self, tags):
+        try:
+            return self._generation(self._conn(), tags)
+        except sqlite3.Error:
+            self.stats['errors'] += 1
+            return None
+
+    def set(self, key, body, status, mimetype, tags, ttl, generation):
+        if generation is None:
+            return
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._generation(conn, tags) != generation:
+                    return
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, body, status, mimetype, ',' + ','.join(tags) + ',', time.time() + ttl)
+                )
+                self._sets += 1
+                if self._sets % 64 == 0:
+                    conn.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),))
+                    conn.execute("""
+                        DELETE FROM entries WHERE key IN (
+                            SELECT key FROM entries ORDER BY expires DESC LIMIT -1 OFFSET ?
+                        )
+                    """, (self.max_entries,))
+            finally:
+                conn.execute("COMMIT")
+            self.stats['stores'] += 1
+        except sqlite3.Error:
+            self.stats['errors'] += 1
+
+    def invalidate(self, *tags):
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for tag in tags:
+                    conn.execute("""
+                        INSERT INTO generations (tag, gen) VALUES (?, 1)
+                        ON CONFLICT (tag) DO UPDATE SET gen = gen + 1
+                    """, (tag,))
+                    conn.execute("DELETE FROM entries WHERE tags LIKE ?", (f'%,{tag},%',))
+            finally:
+                conn.execute("COMMIT")
+        except sqlite3.Error:
+            self.stats['errors'] += 1
+            logging.exception("Falha ao invalidar cache compartilhado")
+
+    def snapshot(self):
+        data = dict(self.stats)
+        try:
+            data['entries'] = self._conn().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        except sqlite3.Error:
+            data['entries'] = None
+        return data
+
+
+shared_cache = SharedCache(SHARED_CACHE_PATH, SHARED_CACHE_MAX_ENTRIES) if SHARED_CACHE_PATH else None
+
+
+class InvalidationListener:
+    """Thread por worker que escuta CACHE_NOTIFY_CHANNEL e invalida o cache local.
+
+    Ao (re)conectar limpa o cache local, já que notificações podem ter sido perdidas.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def ensure_started(self):
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='cache-listener', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        backoff = 1
+        while True:
+            try:
+                conn = psycopg2.connect(**DB_CONFIG)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel}")
+                response_cache.clear()
+                content_versions.clear()
+                backoff = 1
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        note = conn.notifies.pop(0)
+                        tags = [t for t in note.payload.split(',') if t]
+                        response_cache.invalidate(*tags)
+                        content_versions.forget(*tags)
+            except Exception:
+                logging.exception("Listener de invalidação desconectado; reconectando em %ss", backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+
+
+invalidation_listener = InvalidationListener(CACHE_NOTIFY_CHANNEL)
+
+
+class ContentVersions:
+    """Cópia local de content_versions (kind -> (versão, updated_at)), em LRU limitado.
+
+    Entradas são descartadas pelo listener de invalidação, então uma
+    requisição condicional normalmente não precisa ir ao banco. Como em
+    ResponseCache.set, uma leitura que cruzou com forget() não é guardada.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._versions = OrderedDict()
+        self._generations = {}
+        self._epoch = 0
+
+    def _generation(self, kinds):
+        return self._epoch, tuple(self._generations.get(k, 0) for k in kinds)
+
+    def get(self, kinds):
+        with self._lock:
+            missing = [k for k in kinds if k not in self._versions]
+            generation = self._generation(missing)
+        found = {}
+        if missing:
+            rows = query_all(
+                "SELECT kind, version, updated_at FROM content_versions WHERE kind = ANY(%s)",
+                (missing,)
+            )
+            found = {r['kind']: (r['version'], r['updated_at']) for r in rows}
+            with self._lock:
+                if generation == self._generation(missing):
+                    for kind in missing:
+                        self._versions[kind] = found.get(kind, (0, None))
+                    while len(self._versions) > self.max_entries:
+                        self._versions.popitem(last=False)
+        with self._lock:
+            result = {}
+            for kind in kinds:
+                if kind in self._versions:
+                    self._versions.move_to_end(kind)
+                    result[kind] = self._versions[kind]
+                else:
+                    result[kind] = found.get(kind, (0, None))
+            return result
+
+    def forget(self, *kinds):
+        with self._lock:
+            for kind in kinds:
+                self._versions.pop(kind, None)
+                self._generations[kind] = self._generations.get(kind, 0) + 1
+            if len(self._generations) > self.max_entries:
+                # Zerar as gerações exige trocar a época, senão uma leitura em curso voltaria a bater
+                self._generations.clear()
+                self._epoch += 1
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+
+content_versions = ContentVersions(CONTENT_VERSIONS_MAX_ENTRIES)
+
+
+def invalidate_tags(*tags):
+    """Invalida as tags neste worker, no cache compartilhado e (via NOTIFY) nos demais workers.
+
+    Também incrementa content_versions, o que muda os ETags das rotas afetadas.
+    """
+    response_cache.invalidate(*tags)
+    content_versions.forget(*tags)
+    if shared_cache is not None:
+        shared_cache.invalidate(*tags)
+    # Dentro de uma requisição reaproveita a conexão dela; em threads de background usa o pool
+    in_request = has_app_context() and 'db_conn' in g
+    pool = get_pool()
+    conn = get_db() if in_request else pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            timed_execute(cur, """
+                INSERT INTO content_versions (kind, version, updated_at)
+                SELECT unnest(%s::text[]), 1, now()
+                ON CONFLICT (kind) DO UPDATE
+                    SET version = content_versions.version + 1, updated_at = now();
+                SELECT pg_notify(%s, %s);
+            """, (list(tags), CACHE_NOTIFY_CHANNEL, ','.join(tags)))
+    except psycopg2.Error:
+        logging.exception("Falha ao publicar invalidação de cache")
     finally:
-        conn.close()
+        if not in_request:
+            pool.putconn(conn)
+
+
+def cached(*tags, ttl=None):
+    """Decorator para rotas GET públicas: cacheia respostas 200 sob as tags dadas.
+
+    Emite ETag/Last-Modified derivados de content_versions e responde 304 a
+    requisições condicionais sem executar a rota. Ordem de busca do corpo:
+    cache local do worker, cache compartilhado, banco.
+    """
+    ttl = RESPONSE_CACHE_TTL if ttl is None else ttl
+
+    def decorator(f):
+        cache_control = CACHE_CONTROL_ROUTES.get(f.__name__, CACHE_CONTROL_DEFAULT)
+
+        def add_validators(response, etag, last_modified):
+            # Cada codificação é uma representação diferente: ETag próprio
+            encoding = response.headers.get('Content-Encoding')
+            response.set_etag(f"{etag}-{encoding}" if encoding else etag)
+            response.vary.add('Accept-Encoding')
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = cache_control
+            return response
+
+        def encode(response, key, entry):
+            # Comprime uma vez por entrada e codificação; hits seguintes reutilizam os bytes
+            body = response.get_data()
+            encoding = compression_encoding(response.mimetype, len(body))
+            if not encoding:
+                return
+            data = entry.variants.get(encoding) if entry is not None else None
+            if data is None:
+                data = compress_bytes(body, encoding)
+                if entry is not None:
+                    response_cache.add_variant(key, entry, encoding, data)
+            apply_encoding(response, encoding, data)
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            invalidation_listener.ensure_started()
+            key = cache_key()
+
+            versions = content_versions.get(tags)
+            etag = hashlib.sha1(
+                f"{key}|{[versions[t][0] for t in tags]}".encode()
+            ).hexdigest()
+            last_modified = max((v[1] for v in versions.values() if v[1] is not None), default=None)
+            if request.if_none_match:
+                not_modified = any(request.if_none_match.contains_weak(tag)
+                                   for tag in (etag, f"{etag}-gzip", f"{etag}-br"))
+            else:
+                not_modified = (request.if_modified_since is not None and last_modified is not None and
+                                last_modified.replace(microsecond=0) <= request.if_modified_since)
+            if not_modified:
+                return add_validators(app.response_class(status=304), etag, last_modified)
+
+            entry = response_cache.get(key)
+            source = 'HIT'
+            if entry is None and shared_cache is not None:
+                entry = shared_cache.get(key)
+                if entry is not None:
+                    source = 'HIT-SHARED'
+                    entry = response_cache.set(key, entry.body, entry.status, entry.mimetype, tags,
+                                               min(ttl, entry.expires - time.time())) or entry
+            if entry is not None:
+                response = app.response_class(entry.body, status=entry.status, mimetype=entry.mimetype)
+                encode(response, key, entry)
+                response.headers['X-Cache'] = source
+                return add_validators(response, etag, last_modified)
+
+            generation = response_cache.generation(tags)
+            shared_generation = shared_cache.generation(tags) if shared_cache is not None else None
+            response = app.make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+            body = response.get_data()
+            entry = response_cache.set(key, body, response.status_code,
+                                       response.mimetype, tags, ttl, generation)
+            if shared_cache is not None:
+                shared_cache.set(key, body, response.status_code,
+                                 response.mimetype, tags, ttl, shared_generation)
+            encode(response, key, entry)
+            response.headers['X-Cache'] = 'MISS'
+            return add_validators(response, etag, last_modified)
+        return wrapper
+    return decorator
+
+
+# ========================================
+# ESTATÍSTICAS (materialized view content_stats)
+# ========================================
+
+def refresh_content_stats():
+    """Recalcula content_stats sem bloquear leituras"""
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            timed_execute(cur, "REFRESH MATERIALIZED VIEW CONCURRENTLY content_stats")
+    finally:
+        pool.putconn(conn)
+
+
+class StatsRefresher:
+    """Thread de background (uma por worker) que atualiza content_stats.
+
+    Pedidos feitos durante uma atualização são agrupados numa única
+    atualização seguinte; sem pedidos, roda a cada `interval` segundos.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def ensure_started(self):
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='stats-refresher', daemon=True)
+                self._thread.start()
+
+    def request_refresh(self):
+        self.ensure_started()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval or None)
+            self._wake.clear()
+            try:
+                refresh_content_stats()
+                invalidate_tags('stats')
+            except Exception:
+                logging.exception("Falha ao atualizar content_stats")
+
+
+stats_refresher = StatsRefresher(STATS_REFRESH_INTERVAL)
+
+
+def get_content_stats():
+    """Lê a linha única de content_stats"""
+    stats_refresher.ensure_started()
+    return query_one("SELECT * FROM content_stats")
+
+
+@app.cli.command('refresh-stats')
+def refresh_stats_command():
+    """Atualiza a materialized view content_stats"""
+    refresh_content_stats()
+    click.echo("content_stats atualizada")
+
+
+def content_changed(*kinds, sync=False):
+    """Chamado pelos handlers de escrita após alterar conteúdo (palestras, cartilhas...).
+
+    Comandos de CLI passam sync=True: a thread do StatsRefresher morreria com o processo.
+    """
+    invalidate_tags(*kinds)
+    if sync:
+        refresh_content_stats()
+        invalidate_tags('stats')
+    else:
+        stats_refresher.request_refresh()
+
+
+# ========================================
+# MÉTRICAS
+# ========================================
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_HELP = {
+    'amparo_http_requests_total': ('counter', 'Requisições HTTP atendidas'),
+    'amparo_http_request_duration_seconds': ('histogram', 'Latência das requisições por rota'),
+    'amparo_http_requests_in_flight': ('gauge', 'Requisições em andamento'),
+    'amparo_rate_limit_rejections_total': ('counter', 'Requisições recusadas pelo rate limiter (429)'),
+    'amparo_db_queries_total': ('counter', 'Queries executadas pelos handlers'),
+    'amparo_db_query_seconds_total': ('counter', 'Tempo total gasto em queries'),
+    'amparo_db_pool_connections': ('gauge', 'Conexões do pool por estado'),
+    'amparo_db_pool_events_total': ('counter', 'Eventos do pool (checkouts, waits, exhausted...)'),
+    'amparo_db_pool_wait_seconds_total': ('counter', 'Tempo esperando conexão livre no pool'),
+    'amparo_cache_requests_total': ('counter', 'Consultas aos caches de resposta por resultado'),
+}
+
+
+class Metrics:
+    """Métricas do worker em memória; /metrics agrega os snapshots de todos os workers.
+
+    Cada worker grava seu snapshot (uma linha por pid) num SQLite compartilhado,
+    no máximo a cada `flush_interval` segundos. Contadores e histogramas de
+    workers que já morreram continuam somando: ao sair (ou quando collect()
+    encontra o pid morto) a linha é dobrada no acumulado (pid 0) e apagada.
+    Gauges só contam workers vivos com snapshot de até `snapshot_ttl` segundos.
+    """
+
+    ACCUMULATED_PID = 0
+
+    def __init__(self, path, flush_interval, snapshot_ttl):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.snapshot_ttl = snapshot_ttl
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = {}  # (nome, labels) -> valor
+        self._histograms = {}  # (nome, labels) -> [contagem por bucket..., soma, total]
+        self.in_flight = 0
+        self._flushed_at = 0.0
+        self._owner_pid = None
+
+    def inc(self, name, labels=(), value=1):
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        with self._lock:
+            data = self._histograms.get((name, labels))
+            if data is None:
+                data = self._histograms[(name, labels)] = [0] * (len(LATENCY_BUCKETS) + 2)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            data[-2] += value
+            data[-1] += 1
+
+    def add_in_flight(self, delta):
+        with self._lock:
+            self.in_flight += delta
+
+    def snapshot(self):
+        """Estado do worker: contadores próprios + estatísticas do pool e dos caches"""
+        with self._lock:
+            counters = [[name, labels, value] for (name, labels), value in self._counters.items()]
+            histograms = [[name, labels, list(data)] for (name, labels), data in self._histograms.items()]
+            gauges = [['amparo_http_requests_in_flight', (), self.in_flight]]
+
+        pool = get_pool().snapshot()
+        for state in ('in_use', 'idle', 'max'):
+            gauges.append(['amparo_db_pool_connections', (('state', state),), pool[state]])
+        for event in ('checkouts', 'connects', 'recycled', 'failed_pings', 'waits', 'exhausted'):
+            counters.append(['amparo_db_pool_events_total', (('event', event),), pool[event]])
+        counters.append(['amparo_db_pool_wait_seconds_total', (), pool['wait_time_total']])
+
+        caches = [('local', response_cache.snapshot())]
+        if shared_cache is not None:
+            caches.append(('shared', shared_cache.snapshot()))
+        for cache, stats in caches:
+            for result in ('hits', 'misses'):
+                counters.append(['amparo_cache_requests_total', (('cache', cache), ('result', result)), stats[result]])
+        return {'counters': counters, 'histograms': histograms, 'gauges': gauges}
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE IF NOT EXISTS snapshots (pid INTEGER PRIMARY KEY, data TEXT, updated REAL)")
+            if self._owner_pid != os.getpid():
+                # Processo novo: a linha com o mesmo pid é de um worker anterior, já morto
+                self._owner_pid = os.getpid()
+                self._fold(conn, [os.getpid()])
+                atexit.register(self.discard)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _fold(self, conn, pids):
+        """Soma contadores e histogramas das linhas `pids` no acumulado e apaga as linhas"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                f"SELECT pid, data FROM snapshots WHERE pid IN ({','.join('?' * (len(pids) + 1))})",
+                [self.ACCUMULATED_PID] + list(pids)
+            ).fetchall()
+            counters, histograms = {}, {}
+            for _, data in rows:
+                data = json.loads(data)
+                _merge_snapshot(counters, histograms, {}, dict(data, gauges=[]))
+            if len(rows) > 1 or (rows and rows[0][0] != self.ACCUMULATED_PID):
+                accumulated = {
+                    'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+                    'histograms': [[name, labels, values] for (name, labels), values in histograms.items()],
+                    'gauges': [],
+                }
+                conn.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+                             (self.ACCUMULATED_PID, json.dumps(accumulated), time.time()))
+                conn.executemany("DELETE FROM snapshots WHERE pid = ?", [(pid,) for pid in pids])
+        finally:
+            conn.execute("COMMIT")
+
+    def discard(self):
+        """Dobra o snapshot deste worker no acumulado (chamado na saída do processo)"""
+        if self._owner_pid != os.getpid() or not self.path:
+            return
+        try:
+            self.flush(force=True)
+            self._fold(self._conn(), [os.getpid()])
+        except sqlite3.Error:
+            logging.exception("Falha ao acumular snapshot de métricas")
+
+    def flush(self, force=False):
+        if not self.path or (not force and time.monotonic() - self._flushed_at < self.flush_interval):
+            return
+        self._flushed_at = time.monotonic()
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+                (os.getpid(), json.dumps(self.snapshot()), time.time())
+            )
+        except sqlite3.Error:
+            logging.exception("Falha ao gravar snapshot de métricas")
+
+    def collect(self):
+        """Soma os snapshots de todos os workers"""
+        self.flush(force=True)
+        counters, histograms, gauges = {}, {}, {}
+        _merge_snapshot(counters, histograms, gauges, self.snapshot())
+        if self.path:
+            select = "SELECT pid, data, updated FROM snapshots WHERE pid <> ?"
+            try:
+                conn = self._conn()
+                rows = conn.execute(select, (os.getpid(),)).fetchall()
+                dead = [pid for pid, _, _ in rows
+                        if pid != self.ACCUMULATED_PID and not _process_alive(pid)]
+                if dead:
+                    self._fold(conn, dead)
+                    rows = conn.execute(select, (os.getpid(),)).fetchall()
+                for pid, data, updated in rows:
+                    data = json.loads(data)
+                    if time.time() - updated > self.snapshot_ttl:
+                        data['gauges'] = []
+                    _merge_snapshot(counters, histograms, gauges, data)
+            except sqlite3.Error:
+                logging.exception("Falha ao ler snapshots de métricas")
+        return counters, histograms, gauges
+
+
+def _merge_snapshot(counters, histograms, gauges, data):
+    """Soma um snapshot (formato de Metrics.snapshot) nos dicts agregados"""
+    for name, labels, value in data['counters']:
+        key = (name, tuple(map(tuple, labels)))
+        counters[key] = counters.get(key, 0) + value
+    for name, labels, values in data['histograms']:
+        key = (name, tuple(map(tuple, labels)))
+        total = histograms.setdefault(key, [0] * len(values))
+        for i, value in enumerate(values):
+            total[i] += value
+    for name, labels, value in data['gauges']:
+        key = (name, tuple(map(tuple, labels)))
+        gauges[key] = gauges.get(key, 0) + value
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _prom_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def render_metrics(counters, histograms, gauges):
+    """Formato texto de exposição do Prometheus"""
+    by_name = {}
+    for source in (counters, gauges):
+        for (name, labels), value in source.items():
+            by_name.setdefault(name, []).append(f"{name}{_prom_labels(labels)} {value}")
+    for (name, labels), values in histograms.items():
+        lines = by_name.setdefault(name, [])
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, values):
+            cumulative += count
+            lines.append(f"{name}_bucket{_prom_labels(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{name}_bucket{_prom_labels(labels, [('le', '+Inf')])} {values[-1]}")
+        lines.append(f"{name}_sum{_prom_labels(labels)} {values[-2]}")
+        lines.append(f"{name}_count{_prom_labels(labels)} {values[-1]}")
+
+    out = []
+    for name in sorted(by_name):
+        kind, help_text = METRIC_HELP.get(name, ('untyped', ''))
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(by_name[name])
+    return '\n'.join(out) + '\n'
+
+
+metrics = Metrics(METRICS_PATH, METRICS_FLUSH_INTERVAL, METRICS_SNAPSHOT_TTL)
+
+
+# Registrado antes do limiter: requisições recusadas também são medidas
+@app.before_request
+def start_request_metrics():
+    g.metrics_start = time.perf_counter()
+    metrics.add_in_flight(1)
+
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or 'unmatched'
+    start = g.get('metrics_start')
+    if start is not None:
+        metrics.observe('amparo_http_request_duration_seconds', (('endpoint', endpoint),),
+                        time.perf_counter() - start)
+    metrics.inc('amparo_http_requests_total', (('endpoint', endpoint), ('method', request.method),
+                                               ('status', str(response.status_code))))
+    if response.status_code == 429:
+        metrics.inc('amparo_rate_limit_rejections_total', (('endpoint', endpoint),))
+    stats = current_query_stats.get()
+    if stats is not None and stats.count:
+        metrics.inc('amparo_db_queries_total', (), stats.count)
+        metrics.inc('amparo_db_query_seconds_total', (), stats.db_time)
+    metrics.flush()
+    return response
+
+
+@app.teardown_request
+def end_request_metrics(exc):
+    if g.pop('metrics_start', None) is not None:
+        metrics.add_in_flight(-1)
+
+
+def metrics_authorized():
+    """Com METRICS_TOKEN definido, exige Authorization: Bearer <token>"""
+    return not METRICS_TOKEN or secrets.compare_digest(
+        request.headers.get('Authorization', ''), f'Bearer {METRICS_TOKEN}')
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Métricas de todos os workers no formato do Prometheus"""
+    if not metrics_authorized():
+        return jsonify({"error": "Não autorizado"}), 401
+    return Response(render_metrics(*metrics.collect()), mimetype='text/plain; version=0.0.4')
+
+
+# ========================================
+# RATE LIMIT
+# ========================================
+
+class SQLRateLimitStorage(Storage, MovingWindowSupport):
+    """Base dos storages do flask-limiter em tabela SQL (rate_limits).
+
+    A estratégia moving-window é atendida por um contador de janela deslizante:
+    cada chave tem no máximo duas linhas (janela atual e anterior) e a contagem
+    é a atual somada à anterior ponderada pelo quanto ela ainda cobre. O
+    incremento é um único upsert condicional, atômico entre workers.
+    """
+
+    SWEEP_EVERY = 256
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._writes = 0
+
+    def _query(self, sql, params=()):
+        """Executa `sql` (placeholders `?`) em autocommit e retorna as linhas"""
+        raise NotImplementedError
+
+    def _written(self):
+        self._writes += 1
+        if self._writes % self.SWEEP_EVERY == 0:
+            self._query("DELETE FROM rate_limits WHERE expires_at <= ?", (time.time(),))
+
+    def _window(self, key, expiry, now):
+        bucket = int(now // expiry)
+        counts = dict(self._query(
+            "SELECT bucket, count FROM rate_limits WHERE key = ? AND bucket IN (?, ?)",
+            (key, bucket - 1, bucket)
+        ))
+        weight = 1 - (now - bucket * expiry) / expiry
+        return bucket, counts.get(bucket - 1, 0) * weight, counts.get(bucket, 0)
+
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        bucket, previous, current = self._window(key, expiry, time.time())
+        if previous + current + amount > limit:
+            return False
+        # O WHERE do upsert revalida sob o lock da linha: workers concorrentes não passam do limite
+        rows = self._query("""
+            INSERT INTO rate_limits (key, bucket, count, expires_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT (key, bucket) DO UPDATE SET count = rate_limits.count + excluded.count
+            WHERE rate_limits.count + excluded.count <= ?
+            RETURNING count
+        """, (key, bucket, amount, (bucket + 2) * expiry, limit - previous))
+        self._written()
+        return bool(rows)
+
+    def get_moving_window(self, key, limit, expiry):
+        bucket, previous, current = self._window(key, expiry, time.time())
+        return bucket * expiry, int(previous + current)
+
+    # Janela fixa (LIMITER_STRATEGY=fixed-window): linha única com bucket -1
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        now = time.time()
+        rows = self._query("""
+            INSERT INTO rate_limits (key, bucket, count, expires_at) VALUES (?, -1, ?, ?)
+            ON CONFLICT (key, bucket) DO UPDATE SET
+                count = CASE WHEN rate_limits.expires_at <= ? THEN excluded.count
+                             ELSE rate_limits.count + excluded.count END,
+                expires_at = CASE WHEN rate_limits.expires_at <= ? OR ? THEN excluded.expires_at
+                                  ELSE rate_limits.expires_at END
+            RETURNING count
+        """, (key, amount, now + expiry, now, now, bool(elastic_expiry)))
+        self._written()
+        return rows[0][0]
+
+    def get(self, key):
+        rows = self._query(
+            "SELECT count FROM rate_limits WHERE key = ? AND bucket = -1 AND expires_at > ?",
+            (key, time.time())
+        )
+        return rows[0][0] if rows else 0
+
+    def get_expiry(self, key):
+        rows = self._query("SELECT expires_at FROM rate_limits WHERE key = ? AND bucket = -1", (key,))
+        return rows[0][0] if rows else time.time()
+
+    def check(self):
+        try:
+            self._query("SELECT 1")
+            return True
+        except self.base_exceptions:
+            return False
+
+    def reset(self):
+        count = self._query("SELECT count(*) FROM rate_limits")[0][0]
+        self._query("DELETE FROM rate_limits")
+        return count
+
+    def clear(self, key):
+        self._query("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+
+class SQLiteRateLimitStorage(SQLRateLimitStorage):
+    """Contadores num SQLite compartilhado pelos workers do host (amparo+sqlite://<caminho>)"""
+
+    STORAGE_SCHEME = ['amparo+sqlite']
+
+    def __init__(self, uri, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = urlparse(uri).path
+        self._local = threading.local()
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT, bucket INTEGER, count INTEGER, expires_at REAL,
+                    PRIMARY KEY (key, bucket)
+                ) WITHOUT ROWID
+            """)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _query(self, sql, params=()):
+        return self._conn().execute(sql, params).fetchall()
+
+
+class PostgresRateLimitStorage(SQLRateLimitStorage):
+    """Contadores na tabela rate_limits do PostgreSQL (amparo+postgres://), válidos entre hosts"""
+
+    STORAGE_SCHEME = ['amparo+postgres']
+
+    @property
+    def base_exceptions(self):
+        return psycopg2.Error
+
+    def _query(self, sql, params=()):
+        # Mesma regra de invalidate_tags: conexão da requisição se já houver, senão o pool
+        in_request = has_app_context() and 'db_conn' in g
+        pool = get_pool()
+        conn = get_db() if in_request else pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                timed_execute(cur, sql.replace('?', '%s'), params)
+                return cur.fetchall() if cur.description else []
+        finally:
+            if not in_request:
+                pool.putconn(conn)
+
+
+limiter = Limiter(
+    get_remote_address,
+    app=app,
+    default_limits=["200 per hour"],
+    storage_uri=LIMITER_STORAGE_URI,
+    strategy=LIMITER_STRATEGY,
+)
+limiter.exempt(metrics_endpoint)
 
 
 # ========================================
 # AUTENTICAÇÃO
 # ========================================
 
+USER_FIELDS = ('id', 'username', 'email', 'role', 'nome')
+
+
 def get_current_user():
-    """Retorna usuário logado ou None"""
+    """Retorna usuário logado ou None.
+
+    Os dados ficam cacheados na sessão por USER_CACHE_TTL segundos e são
+    descartados quando a versão `user:<id>` muda (aprovação/rejeição).
+    """
     user_id = session.get('user_id')
     if not user_id:
         return None
-    return query_one(
+
+    version_key = f'user:{user_id}'
+    version = content_versions.get((version_key,))[version_key][0]
+    cached_user = session.get('user')
+    if (cached_user and cached_user.get('_v') == version and
+            time.time() - cached_user.get('_at', 0) < USER_CACHE_TTL):
+        return {k: cached_user[k] for k in USER_FIELDS}
+
+    user = query_one(
         "SELECT id, username, email, role, nome FROM auth_users WHERE id = %s",
         (user_id,)
     )
+    if user:
+        session['user'] = dict(user, _v=version, _at=time.time())
+    else:
+        session.pop('user', None)
+    return user
+
+
+def forget_user(user_id):
+    """Invalida os dados de usuário cacheados nas sessões (todos os workers)"""
+    invalidate_tags(f'user:{user_id}')
 
 
 def require_auth(role=None):
@@ -178,6 +1943,50 @@ def require_auth(role=None):
     return decorator
 
 
+# Em ordem de prioridade: vence o primeiro termo da lista presente no texto
+SPEAKER_PROFESSIONS = [
+    ('professor doutor', 'Professor Doutor'),
+    ('professora doutora', 'Professora Doutora'),
+    ('professor adjunto', 'Professor Adjunto'),
+    ('professora adjunta', 'Professora Adjunta'),
+    ('professor', 'Professor'),
+    ('professora', 'Professora'),
+    ('fisioterapeuta', 'Fisioterapeuta'),
+    ('enfermeira', 'Enfermeira'),
+    ('enfermeiro', 'Enfermeiro'),
+    ('fonoaudióloga', 'Fonoaudióloga'),
+    ('fonoaudiólogo', 'Fonoaudiólogo'),
+    ('psicóloga', 'Psicóloga'),
+    ('psicólogo', 'Psicólogo'),
+    ('terapeuta ocupacional', 'Terapeuta Ocupacional'),
+    ('nutricionista', 'Nutricionista'),
+    ('advogada', 'Advogada'),
+    ('advogado', 'Advogado'),
+    ('coordenadora', 'Coordenadora'),
+    ('coordenador', 'Coordenador'),
+    ('diretor técnico', 'Diretor Técnico'),
+    ('diretora técnica', 'Diretora Técnica'),
+]
+# Uma só varredura: o lookahead testa todos os termos em cada posição (inclusive
+# sobrepostos) e a alternância reporta o de maior prioridade que começa ali
+SPEAKER_PROFESSION_RE = re.compile(
+    '(?=' + '|'.join(f'({re.escape(term)})' for term, _ in SPEAKER_PROFESSIONS) + ')',
+    re.IGNORECASE
+)
+
+
+def find_profession(text):
+    """Título da profissão de maior prioridade citada em `text`, ou None"""
+    best = None
+    for match in SPEAKER_PROFESSION_RE.finditer(text):
+        index = match.lastindex - 1
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break
+    return SPEAKER_PROFESSIONS[best][1] if best is not None else None
+
+
 def extract_speaker_info(resume_speaker, affiliation):
     """Extrai informações úteis do resume_speaker para criar um nome descritivo"""
     if not resume_speaker:
@@ -185,40 +1994,14 @@ def extract_speaker_info(resume_speaker, affiliation):
             return affiliation[:97] + '...'
         return affiliation if affiliation else 'Palestrante'
 
-    resume_lower = resume_speaker.lower()
-
-    professions = [
-        ('professor doutor', 'Professor Doutor'),
-        ('professora doutora', 'Professora Doutora'),
-        ('professor adjunto', 'Professor Adjunto'),
-        ('professora adjunta', 'Professora Adjunta'),
-        ('professor', 'Professor'),
-        ('professora', 'Professora'),
-        ('fisioterapeuta', 'Fisioterapeuta'),
-        ('enfermeira', 'Enfermeira'),
-        ('enfermeiro', 'Enfermeiro'),
-        ('fonoaudióloga', 'Fonoaudióloga'),
-        ('fonoaudiólogo', 'Fonoaudiólogo'),
-        ('psicóloga', 'Psicóloga'),
-        ('psicólogo', 'Psicólogo'),
-        ('terapeuta ocupacional', 'Terapeuta Ocupacional'),
-        ('nutricionista', 'Nutricionista'),
-        ('advogada', 'Advogada'),
-        ('advogado', 'Advogado'),
-        ('coordenadora', 'Coordenadora'),
-        ('coordenador', 'Coordenador'),
-        ('diretor técnico', 'Diretor Técnico'),
-        ('diretora técnica', 'Diretora Técnica'),
-    ]
-
-    for search_term, profession_title in professions:
-        if search_term in resume_lower:
-            if affiliation and affiliation != 'Palestrante':
-                if len(affiliation) > 60:
-                    affiliation_short = affiliation[:57] + '...'
-                    return f"{profession_title} - {affiliation_short}"
-                return f"{profession_title} - {affiliation}"
-            return profession_title
+    profession_title = find_profession(resume_speaker)
+    if profession_title:
+        if affiliation and affiliation != 'Palestrante':
+            if len(affiliation) > 60:
+                affiliation_short = affiliation[:57] + '...'
+                return f"{profession_title} - {affiliation_short}"
+            return f"{profession_title} - {affiliation}"
+        return profession_title
 
     if affiliation:
         if len(affiliation) > 100:
@@ -228,26 +2011,197 @@ def extract_speaker_info(resume_speaker, affiliation):
     return 'Palestrante'
 
 
-def serialize_datetime(obj):
-    """Converte datetime para string ISO"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    return obj
+def speaker_display(speaker, resume_speaker, affiliation):
+    """Valor de blog_blog.speaker_display: o speaker informado ou um nome derivado do currículo"""
+    return speaker or extract_speaker_info(resume_speaker or '', affiliation or '')
+
+
+def backfill_speaker_display(recompute=False, batch_size=1000):
+    """Preenche speaker_display em lotes por id; retorna quantas linhas foram gravadas"""
+    last_id, total = 0, 0
+    while True:
+        rows = query_all(f"""
+            SELECT b.id, b.speaker, t.resume_speaker, t.affiliation
+            FROM blog_blog b
+            LEFT JOIN blog_blog_translation t ON t.master_id = b.id AND t.language_code = 'pt-br'
+            WHERE b.id > %s {'' if recompute else 'AND b.speaker_display IS NULL'}
+            ORDER BY b.id
+            LIMIT %s
+        """, (last_id, batch_size))
+        if not rows:
+            return total
+        execute("""
+            UPDATE blog_blog b SET speaker_display = v.display
+            FROM (SELECT unnest(%s::int[]) AS id, unnest(%s::text[]) AS display) v
+            WHERE b.id = v.id
+        """, ([r['id'] for r in rows],
+              [speaker_display(r['speaker'], r['resume_speaker'], r['affiliation']) for r in rows]))
+        total += len(rows)
+        last_id = rows[-1]['id']
+
 
+@app.cli.command('backfill-speakers')
+@click.option('--all', 'recompute', is_flag=True, help='Recalcula também as linhas já preenchidas')
+def backfill_speakers_command(recompute):
+    """Calcula blog_blog.speaker_display das palestras existentes"""
+    with transaction():
+        count = backfill_speaker_display(recompute)
+    if count:
+        content_changed('palestras', sync=True)
+    click.echo(f"speaker_display atualizado em {count} palestras")
+
+
+@lru_cache(maxsize=256)
+def row_mapper(fields):
+    """Função row -> payload com só `fields` (tupla), montada uma vez por formato de query"""
+    getter = itemgetter(*fields)
+    if len(fields) == 1:
+        return lambda row: {fields[0]: getter(row)}
+    return lambda row: dict(zip(fields, getter(row)))
+
+
+class InvalidCursor(ValueError):
+    """Token de paginação por cursor malformado"""
+
+
+@app.errorhandler(InvalidCursor)
+def handle_invalid_cursor(e):
+    return jsonify({'error': 'Cursor inválido'}), 400
+
+
+def encode_cursor(date_value, row_id):
+    """Gera o token opaco de paginação a partir de (data, id) da última linha"""
+    payload = json.dumps([date_value.isoformat() if date_value else None, row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decodifica o token de paginação em (data, id)"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        date_value, row_id = json.loads(raw)
+        return (datetime.fromisoformat(date_value) if date_value else None), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(token)
+
+
+def keyset_condition(date_col, id_col, token):
+    """Condição de seek para ORDER BY date_col DESC NULLS LAST, id_col DESC.
+
+    Retorna ("AND ...", params); token vazio significa primeira página.
+    """
+    if not token:
+        return "", []
+    date_value, row_id = decode_cursor(token)
+    if date_value is None:
+        return f"AND ({date_col} IS NULL AND {id_col} < %s)", [row_id]
+    return (f"AND (({date_col}, {id_col}) < (%s, %s) OR {date_col} IS NULL)",
+            [date_value, row_id])
+
+
+def arg_flag(name):
+    """Lê um parâmetro booleano da query string (1/true/yes/on; ausente ou 0/false = False)"""
+    return request.args.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on', 'sim')
+
+
+class InvalidFields(ValueError):
+    """Campos desconhecidos no parâmetro fields="""
+
+
+@app.errorhandler(InvalidFields)
+def handle_invalid_fields(e):
+    return jsonify({'error': f'Campos inválidos: {", ".join(e.args[0])}'}), 400
+
+
+def parse_fields(allowed, default):
+    """Lê fields=a,b,c e valida contra `allowed`; sem o parâmetro retorna `default`"""
+    raw = request.args.get('fields')
+    if not raw:
+        return list(default)
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise InvalidFields(unknown)
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return fields
 
-def serialize_row(row):
-    """Converte um dict de row do banco para JSON-serializable"""
-    if not row:
-        return row
-    result = {}
-    for k, v in row.items():
-        if isinstance(v, datetime):
-            result[k] = v.isoformat()
-        elif isinstance(v, list):
-            result[k] = v
-        else:
-            result[k] = v
-    return result
+
+def select_list(columns, fields, always=()):
+    """Monta a lista do SELECT com as colunas necessárias para `fields` (sem repetição)"""
+    selected = list(always)
+    for field in fields:
+        for column in columns[field]:
+            if column not in selected:
+                selected.append(column)
+    return ", ".join(selected)
+
+
+# Coleções filhas de blog_blog, agrupadas por blog_post_id: tipo -> (tabela, coluna)
+CHILD_TABLES = {
+    'videos': ('blog_lecturevideo', 'video'),
+    'files': ('blog_lecturefile', 'file'),
+}
+
+
+def child_query(kind, parent_ids):
+    """Query (no formato de run_concurrently) dos filhos `kind` de vários pais"""
+    table, column = CHILD_TABLES[kind]
+    return (query_all, f"""
+        SELECT id, {column}, blog_post_id FROM {table}
+        WHERE blog_post_id = ANY(%s) ORDER BY id
+    """, (list(parent_ids),))
+
+
+class ChildLoader:
+    """Carregador de vídeos/arquivos por requisição: cada pai é buscado uma vez só,
+    e todos os pais pedidos juntos vêm numa única query."""
+
+    def __init__(self):
+        self._loaded = {kind: {} for kind in CHILD_TABLES}
+
+    def prime(self, kind, parent_ids, rows):
+        """Registra linhas já buscadas (ex.: via run_concurrently) para os pais dados"""
+        loaded = self._loaded[kind]
+        for parent_id in parent_ids:
+            loaded.setdefault(parent_id, [])
+        for row in rows:
+            loaded[row['blog_post_id']].append(row)
+
+    def load_many(self, kind, parent_ids):
+        """dict pai -> lista de filhos (vazia se não houver)"""
+        loaded = self._loaded[kind]
+        missing = list({pid for pid in parent_ids if pid not in loaded})
+        if missing:
+            fn, sql, params = child_query(kind, missing)
+            self.prime(kind, missing, fn(sql, params))
+        return {pid: loaded[pid] for pid in parent_ids}
+
+    def load(self, kind, parent_id):
+        return self.load_many(kind, [parent_id])[parent_id]
+
+
+def child_loader():
+    """ChildLoader da requisição atual"""
+    if 'child_loader' not in g:
+        g.child_loader = ChildLoader()
+    return g.child_loader
+
+
+def cursor_response(key, items, rows, per_page, date_key, total=None):
+    """Monta a resposta do modo cursor (rows traz per_page + 1 linhas no máximo)"""
+    next_cursor = None
+    if len(rows) > per_page:
+        last = rows[per_page - 1]
+        next_cursor = encode_cursor(last[date_key], last['id'])
+    body = {
+        key: items[:per_page],
+        "per_page": per_page,
+        "next_cursor": next_cursor
+    }
+    if total is not None:
+        body["total"] = total
+    return jsonify(body)
 
 
 # ========================================
@@ -256,115 +2210,249 @@ def serialize_row(row):
 
 @app.route('/api/health', methods=['GET'])
 def health():
-    """Endpoint de verificação de saúde"""
-    return jsonify({"status": "ok", "message": "AMPARO API is running", "db": "postgresql"})
+    """Endpoint de verificação de saúde.
+
+    deep=1 também mede o round-trip ao banco; pool e caches só aparecem para
+    quem envia o METRICS_TOKEN (Authorization: Bearer), como em /metrics.
+    """
+    body = {"status": "ok", "message": "AMPARO API is running", "db": "postgresql"}
+    if METRICS_TOKEN and metrics_authorized():
+        body.update(pool=get_pool().snapshot(), cache=response_cache.snapshot(),
+                    shared_cache=shared_cache.snapshot() if shared_cache is not None else None)
+    if arg_flag('deep'):
+        start = time.perf_counter()
+        try:
+            query_scalar("SELECT 1")
+        except (psycopg2.Error, PoolExhausted) as e:
+            body.update(status="error", db_error=str(e))
+            return jsonify(body), 503
+        body["db_latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return jsonify(body)
 
 
 @app.route('/api/stats', methods=['GET'])
+@cached('stats')
 def get_stats():
     """Retorna estatísticas gerais do projeto"""
-    total_usuarios = query_scalar("SELECT COUNT(*) FROM users_customuser")
-    total_videos = query_scalar("SELECT COUNT(*) FROM blog_lecturevideo")
-    total_palestras = query_scalar("SELECT COUNT(DISTINCT master_id) FROM blog_blog_translation WHERE master_id IS NOT NULL")
-    total_exercicios = query_scalar("SELECT COUNT(*) FROM exercicios")
-    total_estudos = query_scalar("SELECT COUNT(*) FROM estudos")
-    total_cartilhas = query_scalar("SELECT COUNT(*) FROM blog_lecturefile")
-
-    # Usuários por tipo
-    type_counts_rows = query_all("""
-        SELECT ut.name, COUNT(uc.id) as cnt
-        FROM users_type ut
-        LEFT JOIN users_customuser uc ON uc.type_of_person_id = ut.id
-        GROUP BY ut.name
-    """)
-    type_counts = {r['name']: r['cnt'] for r in type_counts_rows}
-
+    stats = get_content_stats()
     return jsonify({
-        "total_usuarios": total_usuarios,
-        "total_palestras": total_palestras,
-        "total_videos": total_videos,
-        "total_exercicios": total_exercicios,
-        "total_estudos": total_estudos,
-        "total_cartilhas": total_cartilhas,
-        "total_conteudos": total_palestras + total_exercicios + total_estudos + total_cartilhas,
-        "usuarios_por_tipo": type_counts
+        "total_usuarios": stats['total_usuarios'],
+        "total_palestras": stats['total_palestras'],
+        "total_videos": stats['total_videos'],
+        "total_exercicios": stats['total_exercicios'],
+        "total_estudos": stats['total_estudos'],
+        "total_cartilhas": stats['total_cartilhas'],
+        "total_conteudos": (stats['total_palestras'] + stats['total_exercicios'] +
+                            stats['total_estudos'] + stats['total_cartilhas']),
+        "usuarios_por_tipo": stats['usuarios_por_tipo'],
+        "generated_at": stats['generated_at']
     })
 
 
+# Ramos do feed de /api/latest-videos (casam com os índices de 0006 e 0012).
+# key_col desempata linhas com a mesma data dentro do ramo: nas palestras é o id
+# do vídeo, já que uma palestra com vários vídeos aparece uma vez por vídeo
+LATEST_VIDEO_SOURCES = {
+    'palestras': {
+        'date_col': 't.date_time',
+        'key_col': 'v.id',
+        'sql': """
+            SELECT b.id, v.id AS key, t.title, b.speaker, t.date_time AS date, v.video AS video_url,
+                   'palestras' AS source
+            FROM blog_blog b
+            JOIN blog_blog_translation t ON t.master_id = b.id AND t.language_code = 'pt-br'
+            JOIN blog_lecturevideo v ON v.blog_post_id = b.id
+            WHERE b.publish = true
+        """,
+    },
+    'exercicios': {
+        'date_col': 'published_date',
+        'key_col': 'id',
+        'sql': """
+            SELECT id, id AS key, title, instructor AS speaker, published_date AS date, video_url,
+                   'exercicios' AS source
+            FROM exercicios
+            WHERE mockup = false AND video_url IS NOT NULL AND video_url <> ''
+        """,
+    },
+    'estudos': {
+        'date_col': 'published_date',
+        'key_col': 'id',
+        'sql': """
+            SELECT id, id AS key, title, author AS speaker, published_date AS date,
+                   external_link AS video_url, 'estudos' AS source
+            FROM estudos
+            WHERE mockup = false AND content_type = 'video'
+        """,
+    },
+}
+
+
+def encode_feed_cursor(row):
+    """Token opaco de /api/latest-videos: (data, fonte, chave) da última linha"""
+    payload = json.dumps([row['date'].isoformat() if row['date'] else None, row['source'], row['key']])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_feed_cursor(token):
+    """Decodifica o token do feed em (data, fonte, chave)"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        date_value, source, key = json.loads(raw)
+        if source not in LATEST_VIDEO_SOURCES:
+            raise ValueError(source)
+        return (datetime.fromisoformat(date_value) if date_value else None), source, int(key)
+    except (ValueError, TypeError):
+        raise InvalidCursor(token)
+
+
+def feed_seek_condition(src, token):
+    """Condição de seek do ramo `src` para ORDER BY date DESC NULLS LAST, source DESC, key DESC.
+
+    A fonte é constante em cada ramo, então a comparação dela é resolvida aqui.
+    Retorna ("AND ...", params), ou None se o ramo já foi todo consumido.
+    """
+    if not token:
+        return "", []
+    date_value, source, key = decode_feed_cursor(token)
+    date_col = LATEST_VIDEO_SOURCES[src]['date_col']
+    key_col = LATEST_VIDEO_SOURCES[src]['key_col']
+    if date_value is None:
+        if src > source:
+            return None
+        if src == source:
+            return f"AND {date_col} IS NULL AND {key_col} < %s", [key]
+        return f"AND {date_col} IS NULL", []
+    if src == source:
+        return f"AND (({date_col}, {key_col}) < (%s, %s) OR {date_col} IS NULL)", [date_value, key]
+    op = '<' if src > source else '<='
+    return f"AND ({date_col} {op} %s OR {date_col} IS NULL)", [date_value]
+
+
 @app.route('/api/latest-videos', methods=['GET'])
+@cached('palestras', 'exercicios', 'estudos')
 def get_latest_videos():
-    """Retorna os vídeos mais recentes de todas as categorias"""
-    limit = request.args.get('limit', 6, type=int)
+    """Retorna os vídeos mais recentes de todas as categorias.
+
+    Parâmetros: limit e source (lista separada por vírgula de palestras,
+    exercicios, estudos). Com cursor= (vazio na primeira página) a resposta
+    vira {"videos", "per_page", "next_cursor"} para paginar.
+    """
+    limit = min(max(request.args.get('limit', 6, type=int), 1), 50)
+    sources = request.args.get('source', '')
+    sources = [src for src in sources.split(',') if src in LATEST_VIDEO_SOURCES] if sources else list(LATEST_VIDEO_SOURCES)
+    if not sources:
+        return jsonify({"error": "Fonte inválida"}), 400
+    paginate = 'cursor' in request.args
+    fetch = limit + 1 if paginate else limit
+
+    # Cada ramo ordena e limita sozinho (usando seu índice); o ORDER BY externo
+    # só combina no máximo len(sources) * fetch linhas
+    branches = []
+    params = []
+    for src in sources:
+        seek = feed_seek_condition(src, request.args.get('cursor'))
+        if seek is None:
+            continue
+        date_col = LATEST_VIDEO_SOURCES[src]['date_col']
+        key_col = LATEST_VIDEO_SOURCES[src]['key_col']
+        branches.append(f"""({LATEST_VIDEO_SOURCES[src]['sql']} {seek[0]}
+            ORDER BY {date_col} DESC NULLS LAST, {key_col} DESC LIMIT %s)""")
+        params += seek[1] + [fetch]
 
-    all_videos = []
+    rows = query_all(f"""
+        SELECT id, key, title, speaker, date, video_url, source
+        FROM ({" UNION ALL ".join(branches)}) feed
+        ORDER BY date DESC NULLS LAST, source COLLATE "C" DESC, key DESC
+        LIMIT %s
+    """, params + [fetch]) if branches else []
+
+    videos = [{
+        'id': r['id'],
+        'title': r['title'] or '',
+        'speaker': r['speaker'] or '',
+        'date': r['date'] or '',
+        'video_url': r['video_url'] or '',
+        'source': r['source'],
+        'link': f'/conteudos/{r["source"]}/{r["id"]}'
+    } for r in rows[:limit]]
+    if not paginate:
+        return jsonify(videos)
+    return jsonify({
+        "videos": videos,
+        "per_page": limit,
+        "next_cursor": encode_feed_cursor(rows[limit - 1]) if len(rows) > limit else None
+    })
 
-    # Palestras com vídeo (publicadas)
-    palestra_videos = query_all("""
-        SELECT b.id, t.title, b.speaker, t.date_time, v.video, b.subcategory
-        FROM blog_blog b
-        JOIN blog_blog_translation t ON t.master_id = b.id AND t.language_code = 'pt-br'
-        JOIN blog_lecturevideo v ON v.blog_post_id = b.id
-        WHERE b.publish = true
-        ORDER BY t.date_time DESC
-    """)
-    for pv in palestra_videos:
-        all_videos.append({
-            'id': pv['id'],
-            'title': pv['title'] or '',
-            'speaker': pv['speaker'] or '',
-            'date': pv['date_time'].isoformat() if pv['date_time'] else '',
-            'video_url': pv['video'] or '',
-            'source': 'palestras',
-            'link': f'/conteudos/palestras/{pv["id"]}'
-        })
 
-    # Exercícios com vídeo (não mockup)
-    ex_videos = query_all("""
-        SELECT id, title, instructor, published_date, video_url
-        FROM exercicios
-        WHERE mockup = false AND video_url IS NOT NULL AND video_url != ''
-        ORDER BY published_date DESC
-    """)
-    for ex in ex_videos:
-        all_videos.append({
-            'id': ex['id'],
-            'title': ex['title'] or '',
-            'speaker': ex['instructor'] or '',
-            'date': ex['published_date'].isoformat() if ex['published_date'] else '',
-            'video_url': ex['video_url'] or '',
-            'source': 'exercicios',
-            'link': f'/conteudos/exercicios/{ex["id"]}'
-        })
+# Projeções das listagens (fields=): campo da API -> colunas SQL necessárias.
+# `excerpt` é o resumo em texto puro (coluna gerada body_excerpt) e substitui o body.
+PALESTRA_FIELDS = {
+    'id': ('b.id',),
+    'slug': ('b.slug',),
+    # speaker_display só é NULL antes do backfill (`flask backfill-speakers`); até lá
+    # usa o speaker informado, sem ler o currículo (texto pesado) na listagem
+    'speaker': ("COALESCE(b.speaker_display, NULLIF(b.speaker, ''), 'Palestrante') AS speaker_name",),
+    'moderator': ('b.moderator',),
+    'image': (),
+    'publish': (),
+    'banner': (),
+    'title': ('t.title',),
+    'date_time': ('t.date_time',),
+    'resume_speaker': ('t.resume_speaker',),
+    'affiliation': ('t.affiliation',),
+    'body': ('t.body',),
+    'excerpt': ('t.body_excerpt',),
+    'subcategory': ('b.subcategory',),
+    'videos': (),
+}
+PALESTRA_DEFAULT_FIELDS = [f for f in PALESTRA_FIELDS if f != 'excerpt']
+
+EXERCICIO_FIELDS = {c: (c,) for c in (
+    'id', 'mockup', 'title', 'description', 'instructor', 'duration_minutes',
+    'difficulty_level', 'category', 'subcategory', 'video_url', 'thumbnail',
+    'published_date', 'tags', 'equipment_needed', 'body'
+)}
+EXERCICIO_FIELDS['excerpt'] = ('body_excerpt AS excerpt',)
+EXERCICIO_DEFAULT_FIELDS = [f for f in EXERCICIO_FIELDS if f != 'excerpt']
+
+ESTUDO_FIELDS = {c: (c,) for c in (
+    'id', 'mockup', 'title', 'description', 'author', 'content_type', 'published_date',
+    'category', 'tags', 'body', 'external_link', 'pdf_file', 'reading_time_minutes'
+)}
+ESTUDO_FIELDS['excerpt'] = ('body_excerpt AS excerpt',)
+ESTUDO_DEFAULT_FIELDS = [f for f in ESTUDO_FIELDS if f != 'excerpt']
+
+CARTILHA_FIELDS = {
+    'id': ('lf.id',),
+    'blog_post_id': ('lf.blog_post_id',),
+    'title': ('t.title',),
+    'description': ('t.body AS description',),
+    'excerpt': ('t.body_excerpt AS excerpt',),
+    'pdf_file': ('lf.file AS pdf_file',),
+    'published_date': ('t.date_time AS published_date',),
+    'speaker': ('b.speaker',),
+    'affiliation': ('t.affiliation',),
+    # Todos os arquivos da mesma palestra (a própria cartilha incluída)
+    'files': ('lf.blog_post_id',),
+}
+CARTILHA_DEFAULT_FIELDS = [f for f in CARTILHA_FIELDS if f != 'excerpt']
 
-    # Estudos tipo vídeo (não mockup)
-    est_videos = query_all("""
-        SELECT id, title, author, published_date, external_link
-        FROM estudos
-        WHERE mockup = false AND content_type = 'video'
-        ORDER BY published_date DESC
-    """)
-    for est in est_videos:
-        all_videos.append({
-            'id': est['id'],
-            'title': est['title'] or '',
-            'speaker': est['author'] or '',
-            'date': est['published_date'].isoformat() if est['published_date'] else '',
-            'video_url': est['external_link'] or '',
-            'source': 'estudos',
-            'link': f'/conteudos/estudos/{est["id"]}'
-        })
 
-    # Ordenar por data (mais recente primeiro)
-    all_videos.sort(key=lambda x: x.get('date', ''), reverse=True)
-    return jsonify(all_videos[:limit])
+def project_rows(rows, fields):
+    """Aplica a projeção fields= a todas as linhas (o mapeamento é montado uma vez)"""
+    return list(map(row_mapper(tuple(fields)), rows))
 
 
 @app.route('/api/palestras', methods=['GET'])
+@cached('palestras')
 def get_palestras():
-    """Retorna lista de palestras com traduções e vídeos"""
+    """Retorna lista de palestras com traduções e vídeos (fields= limita os campos)"""
     subcategory_filter = request.args.get('subcategory', None)
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 12, type=int)
+    fields = parse_fields(PALESTRA_FIELDS, PALESTRA_DEFAULT_FIELDS)
+    columns = select_list(PALESTRA_FIELDS, fields, always=('b.id', 't.date_time'))
 
     # Query base com JOIN
     where_clause = ""
@@ -373,68 +2461,68 @@ def get_palestras():
         where_clause = "AND b.subcategory = %s"
         params.append(subcategory_filter)
 
-    # Total count
-    total = query_scalar(f"""
+    cursor_mode = 'cursor' in request.args
+    count_sql = f"""
         SELECT COUNT(*)
         FROM blog_blog_translation t
         JOIN blog_blog b ON b.id = t.master_id
         WHERE t.language_code = 'pt-br' {where_clause}
-    """, params)
-
-    # Dados paginados
-    offset = (page - 1) * per_page
-    rows = query_all(f"""
-        SELECT b.id, b.speaker, b.moderator, b.slug, b.image, b.subcategory, b.publish, b.banner,
-               t.title, t.date_time, t.resume_speaker, t.affiliation, t.body
-        FROM blog_blog_translation t
-        JOIN blog_blog b ON b.id = t.master_id
-        WHERE t.language_code = 'pt-br' {where_clause}
-        ORDER BY t.date_time DESC
-        LIMIT %s OFFSET %s
-    """, params + [per_page, offset])
-
-    # Buscar vídeos para esses IDs
-    if rows:
-        ids = [r['id'] for r in rows]
-        videos = query_all("""
-            SELECT id, video, blog_post_id
-            FROM blog_lecturevideo
-            WHERE blog_post_id = ANY(%s)
-        """, (ids,))
-        video_dict = {}
-        for v in videos:
-            bid = v['blog_post_id']
-            if bid not in video_dict:
-                video_dict[bid] = []
-            video_dict[bid].append(serialize_row(v))
+    """
+
+    if cursor_mode:
+        # Keyset: busca per_page + 1 para saber se existe próxima página
+        seek_clause, seek_params = keyset_condition('t.date_time', 'b.id', request.args.get('cursor'))
+        rows = query_all(f"""
+            SELECT {columns}
+            FROM blog_blog_translation t
+            JOIN blog_blog b ON b.id = t.master_id
+            WHERE t.language_code = 'pt-br' {where_clause} {seek_clause}
+            ORDER BY t.date_time DESC NULLS LAST, b.id DESC
+            LIMIT %s
+        """, params + seek_params + [per_page + 1])
+    else:
+        # Dados paginados e total em paralelo
+        offset = (page - 1) * per_page
+        rows, total = run_concurrently((query_all, f"""
+            SELECT {columns}
+            FROM blog_blog_translation t
+            JOIN blog_blog b ON b.id = t.master_id
+            WHERE t.language_code = 'pt-br' {where_clause}
+            ORDER BY t.date_time DESC
+            LIMIT %s OFFSET %s
+        """, params + [per_page, offset]), (query_scalar, count_sql, params))
+
+    # Vídeos de todas as palestras da página numa só query
+    if rows and 'videos' in fields:
+        video_dict = child_loader().load_many('videos', [r['id'] for r in rows])
     else:
         video_dict = {}
 
     result = []
     for r in rows:
-        speaker_name = r['speaker'] or ''
-        if not speaker_name:
-            speaker_name = extract_speaker_info(
-                r['resume_speaker'] or '',
-                r['affiliation'] or ''
-            )
-
-        result.append({
+        item = {
             "id": r['id'],
-            "slug": r['slug'] or f"palestra-{r['id']}",
-            "speaker": speaker_name,
-            "moderator": r['moderator'] or '',
+            "slug": r.get('slug') or f"palestra-{r['id']}",
+            "speaker": r.get('speaker_name'),
+            "moderator": r.get('moderator') or '',
             "image": "",
             "publish": True,
             "banner": False,
-            "title": r['title'],
-            "date_time": r['date_time'].isoformat() if r['date_time'] else None,
-            "resume_speaker": r['resume_speaker'] or '',
-            "affiliation": r['affiliation'] or '',
-            "body": r['body'] or '',
-            "subcategory": r['subcategory'] or 'palestras',
+            "title": r.get('title'),
+            "date_time": r['date_time'],
+            "resume_speaker": r.get('resume_speaker') or '',
+            "affiliation": r.get('affiliation') or '',
+            "body": r.get('body') or '',
+            "excerpt": r.get('body_excerpt') or '',
+            "subcategory": r.get('subcategory') or 'palestras',
             "videos": video_dict.get(r['id'], [])
-        })
+        }
+        result.append(item)
+    result = project_rows(result, fields)
+
+    if cursor_mode:
+        total = query_scalar(count_sql, params) if arg_flag('with_total') else None
+        return cursor_response("palestras", result, rows, per_page, 'date_time', total)
 
     total_pages = (total + per_page - 1) // per_page if total else 0
     return jsonify({
@@ -447,30 +2535,24 @@ def get_palestras():
 
 
 @app.route('/api/palestras/<int:palestra_id>', methods=['GET'])
+@cached('palestras')
 def get_palestra(palestra_id):
     """Retorna detalhes de uma palestra específica"""
-    row = query_one("""
-        SELECT b.id, b.speaker, b.moderator, b.slug, b.subcategory,
+    row, videos = run_concurrently((query_one, """
+        SELECT b.id, b.speaker, b.speaker_display, b.moderator, b.slug, b.subcategory,
                t.title, t.date_time, t.resume_speaker, t.affiliation, t.body
         FROM blog_blog_translation t
         JOIN blog_blog b ON b.id = t.master_id
         WHERE t.language_code = 'pt-br' AND b.id = %s
-    """, (palestra_id,))
+    """, (palestra_id,)), child_query('videos', [palestra_id]))
 
     if not row:
         return jsonify({"error": "Palestra não encontrada"}), 404
+    child_loader().prime('videos', [palestra_id], videos)
 
-    videos = query_all("""
-        SELECT id, video, blog_post_id
-        FROM blog_lecturevideo WHERE blog_post_id = %s
-    """, (palestra_id,))
-
-    speaker_name = row['speaker'] or ''
-    if not speaker_name:
-        speaker_name = extract_speaker_info(
-            row['resume_speaker'] or '',
-            row['affiliation'] or ''
-        )
+    speaker_name = row['speaker_display']
+    if speaker_name is None:
+        speaker_name = speaker_display(row['speaker'], row['resume_speaker'], row['affiliation'])
 
     return jsonify({
         "id": palestra_id,
@@ -481,22 +2563,25 @@ def get_palestra(palestra_id):
         "publish": True,
         "banner": False,
         "title": row['title'],
-        "date_time": row['date_time'].isoformat() if row['date_time'] else None,
+        "date_time": row['date_time'],
         "resume_speaker": row['resume_speaker'] or '',
         "affiliation": row['affiliation'] or '',
         "body": row['body'] or '',
         "subcategory": row['subcategory'] or 'palestras',
-        "videos": [serialize_row(v) for v in videos]
+        "videos": videos
     })
 
 
 # CONTEÚDOS - EXERCÍCIOS
 @app.route('/api/conteudos/exercicios', methods=['GET'])
+@cached('exercicios')
 def get_exercicios():
-    """Retorna lista de exercícios com paginação e filtro por subcategoria"""
+    """Retorna lista de exercícios com paginação e filtro por subcategoria (fields= limita os campos)"""
     subcategory = request.args.get('subcategory', None)
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 12, type=int)
+    fields = parse_fields(EXERCICIO_FIELDS, EXERCICIO_DEFAULT_FIELDS)
+    columns = select_list(EXERCICIO_FIELDS, fields, always=('id', 'published_date'))
 
     where_clause = ""
     params = []
@@ -504,18 +2589,31 @@ def get_exercicios():
         where_clause = "WHERE subcategory = %s"
         params.append(subcategory)
 
-    total = query_scalar(f"SELECT COUNT(*) FROM exercicios {where_clause}", params)
+    if 'cursor' in request.args:
+        seek_clause, seek_params = keyset_condition('published_date', 'id', request.args.get('cursor'))
+        if seek_clause and not where_clause:
+            seek_clause = "WHERE" + seek_clause[3:]
+        rows = query_all(f"""
+            SELECT {columns} FROM exercicios {where_clause} {seek_clause}
+            ORDER BY published_date DESC NULLS LAST, id DESC
+            LIMIT %s
+        """, params + seek_params + [per_page + 1])
+        total = None
+        if arg_flag('with_total'):
+            total = query_scalar(f"SELECT COUNT(*) FROM exercicios {where_clause}", params)
+        return cursor_response("exercicios", project_rows(rows, fields), rows,
+                               per_page, 'published_date', total)
 
     offset = (page - 1) * per_page
-    rows = query_all(f"""
-        SELECT * FROM exercicios {where_clause}
+    rows, total = run_concurrently((query_all, f"""
+        SELECT {columns} FROM exercicios {where_clause}
         ORDER BY published_date DESC
         LIMIT %s OFFSET %s
-    """, params + [per_page, offset])
+    """, params + [per_page, offset]), (query_scalar, f"SELECT COUNT(*) FROM exercicios {where_clause}", params))
 
     total_pages = (total + per_page - 1) // per_page if total else 0
     return jsonify({
-        "exercicios": [serialize_row(r) for r in rows],
+        "exercicios": project_rows(rows, fields),
         "total": total,
         "page": page,
         "per_page": per_page,
@@ -524,12 +2622,16 @@ def get_exercicios():
 
 
 @app.route('/api/conteudos/exercicios/<int:exercicio_id>', methods=['GET'])
+@cached('exercicios')
 def get_exercicio(exercicio_id):
     """Retorna detalhes de um exercício específico"""
-    row = query_one("SELECT * FROM exercicios WHERE id = %s", (exercicio_id,))
+    row = query_one(
+        f"SELECT {select_list(EXERCICIO_FIELDS, EXERCICIO_DEFAULT_FIELDS)} FROM exercicios WHERE id = %s",
+        (exercicio_id,)
+    )
     if not row:
         return jsonify({"error": "Exercício não encontrado"}), 404
-    return jsonify(serialize_row(row))
+    return jsonify(row)
 
 
 # Alias para editor (carrega sem prefixo /conteudos/)
@@ -543,14 +2645,14 @@ def get_exercicio_alias(exercicio_id):
 def create_exercicio():
     """Cria um novo exercício"""
     data = request.json
-    new_id = query_scalar("SELECT COALESCE(MAX(id), 0) + 1 FROM exercicios")
-    execute("""
-        INSERT INTO exercicios (id, mockup, title, description, instructor, duration_minutes,
+    row = execute("""
+        INSERT INTO exercicios (mockup, title, description, instructor, duration_minutes,
             difficulty_level, category, subcategory, video_url, thumbnail,
             published_date, tags, equipment_needed, body)
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+        RETURNING id
     """, (
-        new_id, data.get('mockup', False), data['title'],
+        data.get('mockup', False), data['title'],
         data.get('description', ''), data.get('instructor', ''),
         data.get('duration_minutes'), data.get('difficulty_level', ''),
         data.get('category', ''), data.get('subcategory', ''),
@@ -558,7 +2660,8 @@ def create_exercicio():
         data.get('published_date'), data.get('tags', []),
         data.get('equipment_needed', []), data.get('body', '')
     ))
-    return jsonify({"message": "Exercício criado", "id": new_id}), 201
+    content_changed('exercicios')
+    return jsonify({"message": "Exercício criado", "id": row['id']}), 201
 
 
 @app.route('/api/conteudos/exercicios/<int:exercicio_id>', methods=['PUT'])
@@ -583,6 +2686,7 @@ def update_exercicio(exercicio_id):
         data.get('equipment_needed', []), data.get('body', ''),
         data.get('mockup', False), exercicio_id
     ))
+    content_changed('exercicios')
     return jsonify({"message": "Exercício atualizado"})
 
 
@@ -591,28 +2695,43 @@ def update_exercicio(exercicio_id):
 def delete_exercicio(exercicio_id):
     """Deleta um exercício"""
     execute("DELETE FROM exercicios WHERE id = %s", (exercicio_id,))
+    content_changed('exercicios')
     return jsonify({"message": "Exercício deletado"})
 
 
 # CONTEÚDOS - ESTUDOS
 @app.route('/api/conteudos/estudos', methods=['GET'])
+@cached('estudos')
 def get_estudos():
-    """Retorna lista de estudos com paginação"""
+    """Retorna lista de estudos com paginação (fields= limita os campos)"""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 12, type=int)
-
-    total = query_scalar("SELECT COUNT(*) FROM estudos")
+    fields = parse_fields(ESTUDO_FIELDS, ESTUDO_DEFAULT_FIELDS)
+    columns = select_list(ESTUDO_FIELDS, fields, always=('id', 'published_date'))
+
+    if 'cursor' in request.args:
+        seek_clause, seek_params = keyset_condition('published_date', 'id', request.args.get('cursor'))
+        if seek_clause:
+            seek_clause = "WHERE" + seek_clause[3:]
+        rows = query_all(f"""
+            SELECT {columns} FROM estudos {seek_clause}
+            ORDER BY published_date DESC NULLS LAST, id DESC
+            LIMIT %s
+        """, seek_params + [per_page + 1])
+        total = query_scalar("SELECT COUNT(*) FROM estudos") if arg_flag('with_total') else None
+        return cursor_response("estudos", project_rows(rows, fields), rows,
+                               per_page, 'published_date', total)
 
     offset = (page - 1) * per_page
-    rows = query_all("""
-        SELECT * FROM estudos
+    rows, total = run_concurrently((query_all, f"""
+        SELECT {columns} FROM estudos
         ORDER BY published_date DESC
         LIMIT %s OFFSET %s
-    """, (per_page, offset))
+    """, (per_page, offset)), (query_scalar, "SELECT COUNT(*) FROM estudos", None))
 
     total_pages = (total + per_page - 1) // per_page if total else 0
     return jsonify({
-        "estudos": [serialize_row(r) for r in rows],
+        "estudos": project_rows(rows, fields),
         "total": total,
         "page": page,
         "per_page": per_page,
@@ -621,12 +2740,16 @@ def get_estudos():
 
 
 @app.route('/api/conteudos/estudos/<int:estudo_id>', methods=['GET'])
+@cached('estudos')
 def get_estudo(estudo_id):
     """Retorna detalhes de um estudo específico"""
-    row = query_one("SELECT * FROM estudos WHERE id = %s", (estudo_id,))
+    row = query_one(
+        f"SELECT {select_list(ESTUDO_FIELDS, ESTUDO_DEFAULT_FIELDS)} FROM estudos WHERE id = %s",
+        (estudo_id,)
+    )
     if not row:
         return jsonify({"error": "Estudo não encontrado"}), 404
-    return jsonify(serialize_row(row))
+    return jsonify(row)
 
 
 # Alias para editor (carrega sem prefixo /conteudos/)
@@ -640,20 +2763,21 @@ def get_estudo_alias(estudo_id):
 def create_estudo():
     """Cria um novo estudo"""
     data = request.json
-    new_id = query_scalar("SELECT COALESCE(MAX(id), 0) + 1 FROM estudos")
-    execute("""
-        INSERT INTO estudos (id, mockup, title, description, author, content_type,
+    row = execute("""
+        INSERT INTO estudos (mockup, title, description, author, content_type,
             published_date, category, tags, body, external_link, pdf_file, reading_time_minutes)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING id
     """, (
-        new_id, data.get('mockup', False), data['title'],
+        data.get('mockup', False), data['title'],
         data.get('description', ''), data.get('author', ''),
         data.get('content_type', 'html'), data.get('published_date'),
         data.get('category', ''), data.get('tags', []),
         data.get('body', ''), data.get('external_link', ''),
         data.get('pdf_file', ''), data.get('reading_time_minutes')
     ))
-    return jsonify({"message": "Estudo criado", "id": new_id}), 201
+    content_changed('estudos')
+    return jsonify({"message": "Estudo criado", "id": row['id']}), 201
 
 
 @app.route('/api/conteudos/estudos/<int:estudo_id>', methods=['PUT'])
@@ -677,6 +2801,7 @@ def update_estudo(estudo_id):
         data.get('pdf_file', ''), data.get('reading_time_minutes'),
         data.get('mockup', False), estudo_id
     ))
+    content_changed('estudos')
     return jsonify({"message": "Estudo atualizado"})
 
 
@@ -685,46 +2810,77 @@ def update_estudo(estudo_id):
 def delete_estudo(estudo_id):
     """Deleta um estudo"""
     execute("DELETE FROM estudos WHERE id = %s", (estudo_id,))
+    content_changed('estudos')
     return jsonify({"message": "Estudo deletado"})
 
 
 # CONTEÚDOS - CARTILHAS
 @app.route('/api/conteudos/cartilhas', methods=['GET'])
+@cached('cartilhas')
 def get_cartilhas():
-    """Retorna lista de cartilhas (PDFs)"""
+    """Retorna lista de cartilhas (PDFs) (fields= limita os campos)"""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 12, type=int)
+    fields = parse_fields(CARTILHA_FIELDS, CARTILHA_DEFAULT_FIELDS)
+    columns = select_list(CARTILHA_FIELDS, fields, always=('lf.id', 't.date_time AS published_date'))
 
-    total = query_scalar("""
+    cursor_mode = 'cursor' in request.args
+    count_sql = """
         SELECT COUNT(*)
         FROM blog_lecturefile lf
         JOIN blog_blog_translation t ON t.master_id = lf.blog_post_id AND t.language_code = 'pt-br'
-    """)
-
-    offset = (page - 1) * per_page
-    rows = query_all("""
-        SELECT lf.id, lf.blog_post_id, lf.file as pdf_file,
-               t.title, t.body as description, t.date_time as published_date, t.affiliation,
-               b.speaker
-        FROM blog_lecturefile lf
-        JOIN blog_blog_translation t ON t.master_id = lf.blog_post_id AND t.language_code = 'pt-br'
-        JOIN blog_blog b ON b.id = lf.blog_post_id
-        ORDER BY t.date_time DESC
-        LIMIT %s OFFSET %s
-    """, (per_page, offset))
+    """
+
+    if cursor_mode:
+        seek_clause, seek_params = keyset_condition('t.date_time', 'lf.id', request.args.get('cursor'))
+        if seek_clause:
+            seek_clause = "WHERE" + seek_clause[3:]
+        rows = query_all(f"""
+            SELECT {columns}
+            FROM blog_lecturefile lf
+            JOIN blog_blog_translation t ON t.master_id = lf.blog_post_id AND t.language_code = 'pt-br'
+            JOIN blog_blog b ON b.id = lf.blog_post_id
+            {seek_clause}
+            ORDER BY t.date_time DESC NULLS LAST, lf.id DESC
+            LIMIT %s
+        """, seek_params + [per_page + 1])
+    else:
+        offset = (page - 1) * per_page
+        rows, total = run_concurrently((query_all, f"""
+            SELECT {columns}
+            FROM blog_lecturefile lf
+            JOIN blog_blog_translation t ON t.master_id = lf.blog_post_id AND t.language_code = 'pt-br'
+            JOIN blog_blog b ON b.id = lf.blog_post_id
+            ORDER BY t.date_time DESC
+            LIMIT %s OFFSET %s
+        """, (per_page, offset)), (query_scalar, count_sql, None))
+
+    # Arquivos irmãos de todas as cartilhas da página numa só query
+    if rows and 'files' in fields:
+        file_dict = child_loader().load_many('files', [r['blog_post_id'] for r in rows])
+    else:
+        file_dict = {}
 
     result = []
     for r in rows:
-        result.append({
+        item = {
             "id": r['id'],
-            "blog_post_id": r['blog_post_id'],
-            "title": r['title'] or 'Cartilha',
-            "description": r['description'] or '',
-            "pdf_file": r['pdf_file'],
-            "published_date": r['published_date'].isoformat() if r['published_date'] else None,
-            "speaker": r['speaker'] or '',
-            "affiliation": r['affiliation'] or ''
-        })
+            "blog_post_id": r.get('blog_post_id'),
+            "files": file_dict.get(r.get('blog_post_id'), []),
+            "title": r.get('title') or 'Cartilha',
+            "description": r.get('description') or '',
+            "excerpt": r.get('excerpt') or '',
+            "pdf_file": r.get('pdf_file'),
+            "published_date": r['published_date'],
+            "speaker": r.get('speaker') or '',
+            "affiliation": r.get('affiliation') or ''
+        }
+        result.append(item)
+    result = project_rows(result, fields)
+
+    if cursor_mode:
+        total = query_scalar(count_sql) if arg_flag('with_total') else None
+        return cursor_response("cartilhas", result, rows, per_page, 'published_date', total)
 
     total_pages = (total + per_page - 1) // per_page if total else 0
     return jsonify({
@@ -737,6 +2893,7 @@ def get_cartilhas():
 
 
 @app.route('/api/conteudos/cartilhas/<int:cartilha_id>', methods=['GET'])
+@cached('cartilhas')
 def get_cartilha(cartilha_id):
     """Retorna detalhes de uma cartilha específica"""
     row = query_one("""
@@ -756,10 +2913,11 @@ def get_cartilha(cartilha_id):
     return jsonify({
         "id": row['id'],
         "blog_post_id": row['blog_post_id'],
+        "files": child_loader().load('files', row['blog_post_id']),
         "title": row['title'] or 'Cartilha',
         "description": row['description'] or '',
         "pdf_file": row['pdf_file'],
-        "published_date": row['published_date'].isoformat() if row['published_date'] else None,
+        "published_date": row['published_date'],
         "speaker": row['speaker'] or '',
         "affiliation": row['affiliation'] or '',
         "resume_speaker": row['resume_speaker'] or ''
@@ -782,39 +2940,36 @@ def get_conteudo_palestra(palestra_id):
 def create_palestra():
     """Cria uma nova palestra (blog + translation + videos)"""
     data = request.json
-    new_id = query_scalar("SELECT COALESCE(MAX(id), 0) + 1 FROM blog_blog")
 
-    # Insere blog_blog
-    execute("""
-        INSERT INTO blog_blog (id, speaker, moderator, slug, image, publish, banner, posted, subcategory)
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    # Um único statement: ids vêm das colunas identity via RETURNING
+    row = execute("""
+        WITH new_blog AS (
+            INSERT INTO blog_blog (speaker, speaker_display, moderator, slug, image, publish, banner, posted, subcategory)
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            RETURNING id
+        ), new_translation AS (
+            INSERT INTO blog_blog_translation (language_code, title, body, date_time, resume_speaker, master_id, affiliation)
+            SELECT 'pt-br', %s, %s, %s, %s, id, %s FROM new_blog
+        ), new_videos AS (
+            INSERT INTO blog_lecturevideo (video, blog_post_id)
+            SELECT unnest(%s::varchar[]), id FROM new_blog
+        )
+        SELECT id FROM new_blog
     """, (
-        new_id, data.get('speaker', ''), data.get('moderator', ''),
+        data.get('speaker', ''),
+        speaker_display(data.get('speaker'), data.get('resume_speaker'), data.get('affiliation')),
+        data.get('moderator', ''),
         data.get('slug', ''), data.get('image', ''),
         data.get('publish', True), data.get('banner', False),
-        data.get('posted'), data.get('subcategory', 'palestras')
-    ))
-
-    # Insere tradução pt-br
-    trans_id = query_scalar("SELECT COALESCE(MAX(id), 0) + 1 FROM blog_blog_translation")
-    execute("""
-        INSERT INTO blog_blog_translation (id, language_code, title, body, date_time, resume_speaker, master_id, affiliation)
-        VALUES (%s, 'pt-br', %s, %s, %s, %s, %s, %s)
-    """, (
-        trans_id, data.get('title', ''), data.get('content', ''),
+        data.get('posted'), data.get('subcategory', 'palestras'),
+        data.get('title', ''), data.get('content', ''),
         data.get('date_time'), data.get('resume_speaker', ''),
-        new_id, data.get('affiliation', '')
+        data.get('affiliation', ''),
+        data.get('videos', [])
     ))
+    new_id = row['id']
 
-    # Insere vídeos
-    videos = data.get('videos', [])
-    for video_url in videos:
-        vid_id = query_scalar("SELECT COALESCE(MAX(id), 0) + 1 FROM blog_lecturevideo")
-        execute("""
-            INSERT INTO blog_lecturevideo (id, video, blog_post_id)
-            VALUES (%s, %s, %s)
-        """, (vid_id, video_url, new_id))
-
+    content_changed('palestras', 'cartilhas')
     return jsonify({"message": "Palestra criada", "id": new_id}), 201
 
 
@@ -823,44 +2978,41 @@ def create_palestra():
 def update_palestra(palestra_id):
     """Atualiza uma palestra existente"""
     data = request.json
-    existing = query_one("SELECT id FROM blog_blog WHERE id = %s", (palestra_id,))
-    if not existing:
-        return jsonify({"error": "Palestra não encontrada"}), 404
-
-    # Atualiza blog_blog
-    execute("""
-        UPDATE blog_blog SET speaker=%s, moderator=%s, slug=%s, image=%s,
-            publish=%s, banner=%s, posted=%s, subcategory=%s
-        WHERE id=%s
-    """, (
-        data.get('speaker', ''), data.get('moderator', ''),
-        data.get('slug', ''), data.get('image', ''),
-        data.get('publish', True), data.get('banner', False),
-        data.get('posted'), data.get('subcategory', 'palestras'),
-        palestra_id
-    ))
-
-    # Atualiza tradução pt-br
-    execute("""
-        UPDATE blog_blog_translation SET title=%s, body=%s, date_time=%s,
-            resume_speaker=%s, affiliation=%s
-        WHERE master_id=%s AND language_code='pt-br'
-    """, (
-        data.get('title', ''), data.get('content', ''),
-        data.get('date_time'), data.get('resume_speaker', ''),
-        data.get('affiliation', ''), palestra_id
-    ))
 
-    # Substitui vídeos
-    videos = data.get('videos', [])
-    execute("DELETE FROM blog_lecturevideo WHERE blog_post_id = %s", (palestra_id,))
-    for video_url in videos:
-        vid_id = query_scalar("SELECT COALESCE(MAX(id), 0) + 1 FROM blog_lecturevideo")
+    with transaction():
+        # Atualiza blog_blog (RETURNING também serve de checagem de existência)
+        updated = execute("""
+            UPDATE blog_blog SET speaker=%s, speaker_display=%s, moderator=%s, slug=%s, image=%s,
+                publish=%s, banner=%s, posted=%s, subcategory=%s
+            WHERE id=%s
+            RETURNING id
+        """, (
+            data.get('speaker', ''),
+            speaker_display(data.get('speaker'), data.get('resume_speaker'), data.get('affiliation')),
+            data.get('moderator', ''),
+            data.get('slug', ''), data.get('image', ''),
+            data.get('publish', True), data.get('banner', False),
+            data.get('posted'), data.get('subcategory', 'palestras'),
+            palestra_id
+        ))
+        if not updated:
+            return jsonify({"error": "Palestra não encontrada"}), 404
+
+        # Atualiza tradução pt-br
         execute("""
-            INSERT INTO blog_lecturevideo (id, video, blog_post_id)
-            VALUES (%s, %s, %s)
-        """, (vid_id, video_url, palestra_id))
-
+            UPDATE blog_blog_translation SET title=%s, body=%s, date_time=%s,
+                resume_speaker=%s, affiliation=%s
+            WHERE master_id=%s AND language_code='pt-br'
+        """, (
+            data.get('title', ''), data.get('content', ''),
+            data.get('date_time'), data.get('resume_speaker', ''),
+            data.get('affiliation', ''), palestra_id
+        ))
+
+        # Substitui vídeos
+        replace_children('blog_lecturevideo', 'video', palestra_id, data.get('videos', []))
+
+    content_changed('palestras', 'cartilhas')
     return jsonify({"message": "Palestra atualizada"})
 
 
@@ -868,9 +3020,13 @@ def update_palestra(palestra_id):
 @require_auth('editor')
 def delete_palestra(palestra_id):
     """Deleta uma palestra e seus vídeos/tradução"""
-    execute("DELETE FROM blog_lecturevideo WHERE blog_post_id = %s", (palestra_id,))
-    execute("DELETE FROM blog_blog_translation WHERE master_id = %s", (palestra_id,))
-    execute("DELETE FROM blog_blog WHERE id = %s", (palestra_id,))
+    with transaction():
+        execute("""
+            DELETE FROM blog_lecturevideo WHERE blog_post_id = %(id)s;
+            DELETE FROM blog_blog_translation WHERE master_id = %(id)s;
+            DELETE FROM blog_blog WHERE id = %(id)s;
+        """, {'id': palestra_id})
+    content_changed('palestras', 'cartilhas')
     return jsonify({"message": "Palestra deletada"})
 
 
@@ -880,39 +3036,35 @@ def delete_palestra(palestra_id):
 def create_cartilha():
     """Cria uma nova cartilha (blog + translation + file)"""
     data = request.json
-    new_id = query_scalar("SELECT COALESCE(MAX(id), 0) + 1 FROM blog_blog")
 
-    # Insere blog_blog
-    execute("""
-        INSERT INTO blog_blog (id, speaker, moderator, slug, image, publish, banner, posted, subcategory)
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,'palestras')
+    row = execute("""
+        WITH new_blog AS (
+            INSERT INTO blog_blog (speaker, speaker_display, moderator, slug, image, publish, banner, posted, subcategory)
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,'palestras')
+            RETURNING id
+        ), new_translation AS (
+            INSERT INTO blog_blog_translation (language_code, title, body, date_time, resume_speaker, master_id, affiliation)
+            SELECT 'pt-br', %s, %s, %s, %s, id, %s FROM new_blog
+        ), new_files AS (
+            INSERT INTO blog_lecturefile (file, blog_post_id)
+            SELECT unnest(%s::varchar[]), id FROM new_blog
+        )
+        SELECT id FROM new_blog
     """, (
-        new_id, data.get('speaker', ''), data.get('moderator', ''),
+        data.get('speaker', ''),
+        speaker_display(data.get('speaker'), data.get('resume_speaker'), data.get('affiliation')),
+        data.get('moderator', ''),
         data.get('slug', ''), data.get('image', ''),
         data.get('publish', True), data.get('banner', False),
-        data.get('posted')
-    ))
-
-    # Insere tradução pt-br
-    trans_id = query_scalar("SELECT COALESCE(MAX(id), 0) + 1 FROM blog_blog_translation")
-    execute("""
-        INSERT INTO blog_blog_translation (id, language_code, title, body, date_time, resume_speaker, master_id, affiliation)
-        VALUES (%s, 'pt-br', %s, %s, %s, %s, %s, %s)
-    """, (
-        trans_id, data.get('title', ''), data.get('content', ''),
+        data.get('posted'),
+        data.get('title', ''), data.get('content', ''),
         data.get('date_time'), data.get('resume_speaker', ''),
-        new_id, data.get('affiliation', '')
+        data.get('affiliation', ''),
+        data.get('files', [])
     ))
+    new_id = row['id']
 
-    # Insere arquivos
-    files = data.get('files', [])
-    for file_path in files:
-        file_id = query_scalar("SELECT COALESCE(MAX(id), 0) + 1 FROM blog_lecturefile")
-        execute("""
-            INSERT INTO blog_lecturefile (id, file, blog_post_id)
-            VALUES (%s, %s, %s)
-        """, (file_id, file_path, new_id))
-
+    content_changed('palestras', 'cartilhas')
     return jsonify({"message": "Cartilha criada", "id": new_id}), 201
 
 
@@ -921,45 +3073,47 @@ def create_cartilha():
 def update_cartilha(cartilha_id):
     """Atualiza uma cartilha existente"""
     data = request.json
-    cartilha = query_one("SELECT blog_post_id FROM blog_lecturefile WHERE id = %s", (cartilha_id,))
-    if not cartilha:
-        return jsonify({"error": "Cartilha não encontrada"}), 404
-
-    blog_id = cartilha['blog_post_id']
 
-    # Atualiza blog_blog
-    execute("""
-        UPDATE blog_blog SET speaker=%s, moderator=%s, slug=%s, image=%s,
-            publish=%s, banner=%s, posted=%s
-        WHERE id=%s
-    """, (
-        data.get('speaker', ''), data.get('moderator', ''),
-        data.get('slug', ''), data.get('image', ''),
-        data.get('publish', True), data.get('banner', False),
-        data.get('posted'), blog_id
-    ))
+    with transaction():
+        # FOR UPDATE: impede que uma edição concorrente troque os arquivos no meio
+        cartilha = query_one(
+            "SELECT blog_post_id FROM blog_lecturefile WHERE id = %s FOR UPDATE",
+            (cartilha_id,)
+        )
+        if not cartilha:
+            return jsonify({"error": "Cartilha não encontrada"}), 404
 
-    # Atualiza tradução
-    execute("""
-        UPDATE blog_blog_translation SET title=%s, body=%s, date_time=%s,
-            resume_speaker=%s, affiliation=%s
-        WHERE master_id=%s AND language_code='pt-br'
-    """, (
-        data.get('title', ''), data.get('content', ''),
-        data.get('date_time'), data.get('resume_speaker', ''),
-        data.get('affiliation', ''), blog_id
-    ))
+        blog_id = cartilha['blog_post_id']
 
-    # Substitui arquivos
-    files = data.get('files', [])
-    execute("DELETE FROM blog_lecturefile WHERE blog_post_id = %s", (blog_id,))
-    for file_path in files:
-        file_id = query_scalar("SELECT COALESCE(MAX(id), 0) + 1 FROM blog_lecturefile")
+        # Atualiza blog_blog
         execute("""
-            INSERT INTO blog_lecturefile (id, file, blog_post_id)
-            VALUES (%s, %s, %s)
-        """, (file_id, file_path, blog_id))
-
+            UPDATE blog_blog SET speaker=%s, speaker_display=%s, moderator=%s, slug=%s, image=%s,
+                publish=%s, banner=%s, posted=%s
+            WHERE id=%s
+        """, (
+            data.get('speaker', ''),
+            speaker_display(data.get('speaker'), data.get('resume_speaker'), data.get('affiliation')),
+            data.get('moderator', ''),
+            data.get('slug', ''), data.get('image', ''),
+            data.get('publish', True), data.get('banner', False),
+            data.get('posted'), blog_id
+        ))
+
+        # Atualiza tradução
+        execute("""
+            UPDATE blog_blog_translation SET title=%s, body=%s, date_time=%s,
+                resume_speaker=%s, affiliation=%s
+            WHERE master_id=%s AND language_code='pt-br'
+        """, (
+            data.get('title', ''), data.get('content', ''),
+            data.get('date_time'), data.get('resume_speaker', ''),
+            data.get('affiliation', ''), blog_id
+        ))
+
+        # Substitui arquivos
+        replace_children('blog_lecturefile', 'file', blog_id, data.get('files', []))
+
+    content_changed('palestras', 'cartilhas')
     return jsonify({"message": "Cartilha atualizada"})
 
 
@@ -967,39 +3121,43 @@ def update_cartilha(cartilha_id):
 @require_auth('editor')
 def delete_cartilha(cartilha_id):
     """Deleta uma cartilha"""
-    cartilha = query_one("SELECT blog_post_id FROM blog_lecturefile WHERE id = %s", (cartilha_id,))
-    if not cartilha:
-        return jsonify({"error": "Cartilha não encontrada"}), 404
-    blog_id = cartilha['blog_post_id']
-    execute("DELETE FROM blog_lecturefile WHERE blog_post_id = %s", (blog_id,))
-    execute("DELETE FROM blog_blog_translation WHERE master_id = %s", (blog_id,))
-    execute("DELETE FROM blog_blog WHERE id = %s", (blog_id,))
+    with transaction():
+        cartilha = query_one(
+            "SELECT blog_post_id FROM blog_lecturefile WHERE id = %s FOR UPDATE",
+            (cartilha_id,)
+        )
+        if not cartilha:
+            return jsonify({"error": "Cartilha não encontrada"}), 404
+        execute("""
+            DELETE FROM blog_lecturefile WHERE blog_post_id = %(id)s;
+            DELETE FROM blog_blog_translation WHERE master_id = %(id)s;
+            DELETE FROM blog_blog WHERE id = %(id)s;
+        """, {'id': cartilha['blog_post_id']})
+    content_changed('palestras', 'cartilhas')
     return jsonify({"message": "Cartilha deletada"})
 
 
 # CONTEÚDOS - STATS
 @app.route('/api/conteudos/stats', methods=['GET'])
+@cached('stats')
 def get_conteudos_stats():
     """Retorna estatísticas de todos os tipos de conteúdo"""
-    total_usuarios = query_scalar("SELECT COUNT(*) FROM users_customuser")
-    total_videos = query_scalar("SELECT COUNT(*) FROM blog_lecturevideo")
-    total_palestras = query_scalar("SELECT COUNT(DISTINCT master_id) FROM blog_blog_translation WHERE master_id IS NOT NULL")
-    total_exercicios = query_scalar("SELECT COUNT(*) FROM exercicios")
-    total_estudos = query_scalar("SELECT COUNT(*) FROM estudos")
-    total_cartilhas = query_scalar("SELECT COUNT(*) FROM blog_lecturefile")
-
+    stats = get_content_stats()
     return jsonify({
-        "total_usuarios": total_usuarios,
-        "total_palestras": total_palestras,
-        "total_videos": total_videos,
-        "total_exercicios": total_exercicios,
-        "total_estudos": total_estudos,
-        "total_cartilhas": total_cartilhas,
-        "total_conteudos": total_palestras + total_exercicios + total_estudos + total_cartilhas
+        "total_usuarios": stats['total_usuarios'],
+        "total_palestras": stats['total_palestras'],
+        "total_videos": stats['total_videos'],
+        "total_exercicios": stats['total_exercicios'],
+        "total_estudos": stats['total_estudos'],
+        "total_cartilhas": stats['total_cartilhas'],
+        "total_conteudos": (stats['total_palestras'] + stats['total_exercicios'] +
+                            stats['total_estudos'] + stats['total_cartilhas']),
+        "generated_at": stats['generated_at']
     })
 
 
 @app.route('/api/pages', methods=['GET'])
+@cached('pages')
 def get_pages():
     """Retorna páginas estáticas"""
     rows = query_all("""
@@ -1023,6 +3181,474 @@ def get_pages():
     return jsonify(result)
 
 
+# BUSCA - full-text em português
+# As expressões abaixo são idênticas às dos índices GIN (migrations/0002_search_indexes.sql);
+# qualquer alteração precisa ser replicada lá para que o índice continue sendo usado.
+SEARCH_TSV = {
+    'palestras': (
+        "(setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('portuguese', coalesce(resume_speaker, '') || ' ' || coalesce(affiliation, '')), 'B') || "
+        "setweight(to_tsvector('portuguese', coalesce(body, '')), 'C'))"
+    ),
+    'exercicios': (
+        "(setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('portuguese', coalesce(description, '') || ' ' || coalesce(instructor, '')), 'B') || "
+        "setweight(to_tsvector('portuguese', coalesce(body, '')), 'C'))"
+    ),
+    'estudos': (
+        "(setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('portuguese', coalesce(description, '') || ' ' || coalesce(author, '')), 'B') || "
+        "setweight(to_tsvector('portuguese', coalesce(body, '')), 'C'))"
+    ),
+    'pages': (
+        "(setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('portuguese', coalesce(summary, '')), 'B') || "
+        "setweight(to_tsvector('portuguese', coalesce(body, '')), 'C'))"
+    ),
+}
+
+SEARCH_SOURCES = {
+    'palestras': f"""
+        SELECT 'palestras' AS source, b.id, NULL::text AS slug, t.title, t.date_time AS date,
+               ts_rank({SEARCH_TSV['palestras']}, q.q) AS rank,
+               coalesce(t.resume_speaker, '') || ' ' || coalesce(t.body, '') AS text
+        FROM blog_blog_translation t
+        JOIN blog_blog b ON b.id = t.master_id, q
+        WHERE t.language_code = 'pt-br' AND {SEARCH_TSV['palestras']} @@ q.q
+    """,
+    'exercicios': f"""
+        SELECT 'exercicios' AS source, id, NULL::text AS slug, title, published_date AS date,
+               ts_rank({SEARCH_TSV['exercicios']}, q.q) AS rank,
+               coalesce(description, '') || ' ' || coalesce(body, '') AS text
+        FROM exercicios, q
+        WHERE {SEARCH_TSV['exercicios']} @@ q.q
+    """,
+    'estudos': f"""
+        SELECT 'estudos' AS source, id, NULL::text AS slug, title, published_date AS date,
+               ts_rank({SEARCH_TSV['estudos']}, q.q) AS rank,
+               coalesce(description, '') || ' ' || coalesce(body, '') AS text
+        FROM estudos, q
+        WHERE {SEARCH_TSV['estudos']} @@ q.q
+    """,
+    'pages': f"""
+        SELECT 'pages' AS source, p.id, p.slug::text, t.title, p.posted::timestamptz AS date,
+               ts_rank({SEARCH_TSV['pages']}, q.q) AS rank,
+               coalesce(t.summary, '') || ' ' || coalesce(t.body, '') AS text
+        FROM pages_page_translation t
+        JOIN pages_page p ON p.id = t.master_id, q
+        WHERE t.language_code = 'pt-br' AND p.enabled = true AND {SEARCH_TSV['pages']} @@ q.q
+    """,
+}
+
+
+def search_link(source, item_id, slug):
+    """Monta o link do frontend para um resultado de busca"""
+    if source == 'pages':
+        return f'/pages/{slug}'
+    return f'/conteudos/{source}/{item_id}'
+
+
+@app.route('/api/search', methods=['GET'])
+@cached('palestras', 'cartilhas', 'exercicios', 'estudos', 'pages')
+def search():
+    """Busca full-text (português) em palestras, exercícios, estudos e páginas"""
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({"error": "Parâmetro q é obrigatório"}), 400
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 12, type=int), 1), 50)
+
+    types = request.args.get('type', '')
+    sources = [t for t in types.split(',') if t in SEARCH_SOURCES] if types else list(SEARCH_SOURCES)
+    if not sources:
+        return jsonify({"error": "Tipo de conteúdo inválido"}), 400
+
+    union = " UNION ALL ".join(SEARCH_SOURCES[src] for src in sources)
+    offset = (page - 1) * per_page
+    # ts_headline é caro: só é calculado para as linhas da página atual
+    rows = query_all(f"""
+        WITH q AS (SELECT websearch_to_tsquery('portuguese', %s) AS q),
+        hits AS ({union}),
+        page AS (
+            SELECT source, id, slug, title, date, rank, text, COUNT(*) OVER () AS total
+            FROM hits
+            ORDER BY rank DESC, date DESC NULLS LAST, id DESC
+            LIMIT %s OFFSET %s
+        )
+        SELECT page.source, page.id, page.slug, page.title, page.date, page.rank, page.total,
+               ts_headline('portuguese', regexp_replace(page.text, '<[^>]+>', ' ', 'g'), q.q,
+                           'MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=" … "') AS snippet
+        FROM page, q
+        ORDER BY page.rank DESC, page.date DESC NULLS LAST, page.id DESC
+    """, (q, per_page, offset))
+
+    total = rows[0]['total'] if rows else 0
+    if not rows and page > 1:
+        # Página além do fim: o total ainda é útil para o cliente
+        total = query_scalar(f"""
+            WITH q AS (SELECT websearch_to_tsquery('portuguese', %s) AS q)
+            SELECT COUNT(*) FROM ({union}) hits
+        """, (q,))
+
+    results = [{
+        "source": r['source'],
+        "id": r['id'],
+        "title": r['title'] or '',
+        "snippet": r['snippet'] or '',
+        "rank": float(r['rank']),
+        "date": r['date'],
+        "link": search_link(r['source'], r['id'], r['slug'])
+    } for r in rows]
+
+    total_pages = (total + per_page - 1) // per_page if total else 0
+    return jsonify({
+        "results": results,
+        "query": q,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": total_pages
+    })
+
+
+# EXPORTAÇÃO - NDJSON via cursor nomeado (memória constante)
+EXPORT_QUERIES = {
+    'palestras': ('b.updated_at', """
+        SELECT b.id, b.slug, b.speaker, b.moderator, b.subcategory, b.publish, b.banner, b.posted,
+               t.title, t.date_time, t.resume_speaker, t.affiliation, t.body,
+               ARRAY(SELECT v.video FROM blog_lecturevideo v WHERE v.blog_post_id = b.id ORDER BY v.id) AS videos,
+               ARRAY(SELECT f.file FROM blog_lecturefile f WHERE f.blog_post_id = b.id ORDER BY f.id) AS files,
+               b.updated_at
+        FROM blog_blog b
+        JOIN blog_blog_translation t ON t.master_id = b.id AND t.language_code = 'pt-br'
+        {where}
+        ORDER BY b.id
+    """),
+    'cartilhas': ('b.updated_at', """
+        SELECT lf.id, lf.blog_post_id, lf.file AS pdf_file,
+               t.title, t.body AS description, t.date_time AS published_date,
+               t.affiliation, t.resume_speaker, b.speaker, b.updated_at
+        FROM blog_lecturefile lf
+        JOIN blog_blog_translation t ON t.master_id = lf.blog_post_id AND t.language_code = 'pt-br'
+        JOIN blog_blog b ON b.id = lf.blog_post_id
+        {where}
+        ORDER BY lf.id
+    """),
+    'exercicios': ('updated_at', f"""
+        SELECT {select_list(EXERCICIO_FIELDS, EXERCICIO_DEFAULT_FIELDS)}, updated_at
+        FROM exercicios
+        {{where}}
+        ORDER BY id
+    """),
+    'estudos': ('updated_at', f"""
+        SELECT {select_list(ESTUDO_FIELDS, ESTUDO_DEFAULT_FIELDS)}, updated_at
+        FROM estudos
+        {{where}}
+        ORDER BY id
+    """),
+}
+
+
+# Um "+03:00" sem URL-encoding chega como " 03:00" depois da hora
+UNENCODED_OFFSET_RE = re.compile(r'(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?) (\d{2}(?::?\d{2})?)$')
+
+
+@app.route('/api/export/<content_type>', methods=['GET'])
+@require_auth('editor')
+def export_content(content_type):
+    """Exporta todo o conteúdo de um tipo como NDJSON (updated_since= para incrementais)"""
+    if content_type not in EXPORT_QUERIES:
+        return jsonify({"error": "Tipo de conteúdo inválido"}), 404
+
+    updated_col, sql = EXPORT_QUERIES[content_type]
+    where, params = "", []
+    updated_since = request.args.get('updated_since')
+    if updated_since:
+        try:
+            params.append(datetime.fromisoformat(UNENCODED_OFFSET_RE.sub(r'\1+\2', updated_since)))
+        except ValueError:
+            return jsonify({"error": "Parâmetro updated_since inválido"}), 400
+        where = f"WHERE {updated_col} > %s"
+    sql = sql.format(where=where)
+
+    def generate():
+        # Cursor nomeado exige transação; as linhas chegam do servidor em lotes de EXPORT_ITERSIZE
+        with transaction() as conn:
+            with conn.cursor(name=f'export_{content_type}',
+                             cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                timed_execute(cur, sql, params)
+                while True:
+                    # Cada lote é um FETCH no servidor: medido como a própria query
+                    with timed_query(sql):
+                        rows = cur.fetchmany(EXPORT_ITERSIZE)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield app.json.dumps_bytes(row) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+# IMPORTAÇÃO EM LOTE - NDJSON/CSV -> COPY em tabela temporária -> merge numa transação
+# (campo, tipo, obrigatório, padrão) — padrões iguais aos dos handlers create_*
+IMPORT_SPECS = {
+    'exercicios': [
+        ('title', 'text', True, None),
+        ('description', 'text', False, ''),
+        ('instructor', 'text', False, ''),
+        ('duration_minutes', 'int', False, None),
+        ('difficulty_level', 'text', False, ''),
+        ('category', 'text', False, ''),
+        ('subcategory', 'text', False, ''),
+        ('video_url', 'text', False, ''),
+        ('thumbnail', 'text', False, ''),
+        ('published_date', 'timestamp', False, None),
+        ('tags', 'array', False, []),
+        ('equipment_needed', 'array', False, []),
+        ('body', 'text', False, ''),
+        ('mockup', 'bool', False, False),
+    ],
+    'estudos': [
+        ('title', 'text', True, None),
+        ('description', 'text', False, ''),
+        ('author', 'text', False, ''),
+        ('content_type', 'text', False, 'html'),
+        ('published_date', 'timestamp', False, None),
+        ('category', 'text', False, ''),
+        ('tags', 'array', False, []),
+        ('body', 'text', False, ''),
+        ('external_link', 'text', False, ''),
+        ('pdf_file', 'text', False, ''),
+        ('reading_time_minutes', 'int', False, None),
+        ('mockup', 'bool', False, False),
+    ],
+    'palestras': [
+        ('title', 'text', True, None),
+        ('content', 'text', False, ''),
+        ('date_time', 'timestamp', False, None),
+        ('resume_speaker', 'text', False, ''),
+        ('affiliation', 'text', False, ''),
+        ('speaker', 'text', False, ''),
+        ('moderator', 'text', False, ''),
+        ('slug', 'text', False, ''),
+        ('image', 'text', False, ''),
+        ('publish', 'bool', False, True),
+        ('banner', 'bool', False, False),
+        ('posted', 'date', False, None),
+        ('subcategory', 'text', False, 'palestras'),
+        ('videos', 'array', False, []),
+    ],
+}
+
+IMPORT_PG_TYPES = {
+    'text': 'text', 'int': 'integer', 'bool': 'boolean',
+    'timestamp': 'timestamp with time zone', 'date': 'date', 'array': 'text[]',
+}
+
+IMPORT_MERGE_SQL = {
+    'exercicios': """
+        INSERT INTO exercicios (title, description, instructor, duration_minutes, difficulty_level,
+            category, subcategory, video_url, thumbnail, published_date, tags, equipment_needed,
+            body, mockup)
+        SELECT title, description, instructor, duration_minutes, difficulty_level,
+            category, subcategory, video_url, thumbnail, published_date, tags, equipment_needed,
+            body, mockup
+        FROM import_staging ORDER BY n
+    """,
+    'estudos': """
+        INSERT INTO estudos (title, description, author, content_type, published_date, category,
+            tags, body, external_link, pdf_file, reading_time_minutes, mockup)
+        SELECT title, description, author, content_type, published_date, category,
+            tags, body, external_link, pdf_file, reading_time_minutes, mockup
+        FROM import_staging ORDER BY n
+    """,
+    # ids de blog_blog são reservados antes para ligar tradução e vídeos a cada linha
+    'palestras': """
+        UPDATE import_staging SET id = nextval(pg_get_serial_sequence('public.blog_blog', 'id'));
+        INSERT INTO blog_blog (id, speaker, moderator, slug, image, publish, banner, posted, subcategory)
+        SELECT id, speaker, moderator, slug, image, publish, banner, posted, subcategory
+        FROM import_staging ORDER BY n;
+        INSERT INTO blog_blog_translation (language_code, title, body, date_time, resume_speaker, master_id, affiliation)
+        SELECT 'pt-br', title, content, date_time, resume_speaker, id, affiliation
+        FROM import_staging ORDER BY n;
+        INSERT INTO blog_lecturevideo (video, blog_post_id)
+        SELECT unnest(videos), id FROM import_staging ORDER BY n;
+    """,
+}
+
+IMPORT_TAGS = {
+    'exercicios': ('exercicios',),
+    'estudos': ('estudos',),
+    'palestras': ('palestras', 'cartilhas'),
+}
+
+
+def parse_import_value(kind, value):
+    """Converte um valor de entrada (JSON ou CSV) para o tipo do campo"""
+    if kind == 'text':
+        return str(value)
+    if kind == 'int':
+        return int(value)
+    if kind == 'bool':
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in ('1', 'true', 't', 'sim', 's', 'yes'):
+            return True
+        if text in ('0', 'false', 'f', 'não', 'nao', 'n', 'no'):
+            return False
+        raise ValueError(f"booleano inválido: {value!r}")
+    if kind == 'timestamp':
+        return datetime.fromisoformat(str(value))
+    if kind == 'date':
+        return date.fromisoformat(str(value))
+    if kind == 'array':
+        if isinstance(value, str):
+            # CSV: lista JSON ou itens separados por ';'
+            value = json.loads(value) if value.lstrip().startswith('[') else \
+                [v.strip() for v in value.split(';') if v.strip()]
+        if not isinstance(value, list):
+            raise ValueError("lista esperada")
+        return [str(v) for v in value]
+    raise ValueError(kind)
+
+
+def validate_import_row(spec, raw):
+    """Valida e normaliza uma linha; retorna (valores, erro)"""
+    if not isinstance(raw, dict):
+        return None, "objeto JSON esperado"
+    values = []
+    for name, kind, required, default in spec:
+        value = raw.get(name)
+        if value is None or value == '':
+            if required:
+                return None, f"campo obrigatório ausente: {name}"
+            values.append(default)
+            continue
+        try:
+            values.append(parse_import_value(kind, value))
+        except (ValueError, TypeError) as e:
+            return None, f"{name}: {e}"
+    return values, None
+
+
+def read_import_rows(stream, fmt):
+    """Itera (linha, dict | erro) de um stream NDJSON ou CSV"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_no, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except ValueError as e:
+                yield line_no, ValueError(f"JSON inválido: {e}")
+
+
+def copy_text(value):
+    """Formata um valor para o formato texto do COPY"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, list):
+        value = '{' + ','.join(
+            '"' + v.replace('\\', '\\\\').replace('"', '\\"') + '"' for v in value
+        ) + '}'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def import_content(content_type, rows, strict=False, dry_run=False, sync=False):
+    """Valida, copia para staging e faz o merge de um lote numa única transação.
+
+    `rows` é um iterável de (linha, dict | Exception). Linhas inválidas são
+    reportadas em `errors`; com strict=True nenhuma linha é gravada se houver erro.
+    `sync` é repassado a content_changed.
+    """
+    spec = IMPORT_SPECS[content_type]
+    buffer = io.StringIO()
+    errors = []
+    valid = 0
+    for line_no, raw in rows:
+        if isinstance(raw, Exception):
+            errors.append({"line": line_no, "error": str(raw)})
+            continue
+        values, error = validate_import_row(spec, raw)
+        if error:
+            errors.append({"line": line_no, "error": error})
+            continue
+        valid += 1
+        buffer.write('\t'.join([str(valid)] + [copy_text(v) for v in values]) + '\n')
+
+    result = {"valid": valid, "imported": 0, "errors": errors}
+    if dry_run or not valid or (strict and errors):
+        return result
+
+    columns = [name for name, _, _, _ in spec]
+    column_defs = ", ".join(f"{name} {IMPORT_PG_TYPES[kind]}" for name, kind, _, _ in spec)
+    buffer.seek(0)
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            timed_execute(cur, f"CREATE TEMP TABLE import_staging (n integer, {column_defs}, id integer) ON COMMIT DROP")
+            copy_sql = f"COPY import_staging (n, {', '.join(columns)}) FROM STDIN"
+            with timed_query(copy_sql):
+                cur.copy_expert(copy_sql, buffer)
+            timed_execute(cur, IMPORT_MERGE_SQL[content_type])
+        if content_type == 'palestras':
+            backfill_speaker_display()
+    result["imported"] = valid
+    content_changed(*IMPORT_TAGS[content_type], sync=sync)
+    return result
+
+
+@app.route('/api/import/<content_type>', methods=['POST'])
+@require_auth('editor')
+def import_endpoint(content_type):
+    """Importa um lote NDJSON ou CSV (corpo da requisição ou arquivo `file`)"""
+    if content_type not in IMPORT_SPECS:
+        return jsonify({"error": "Tipo de conteúdo inválido"}), 404
+
+    upload = request.files.get('file')
+    if upload is not None:
+        stream = upload.stream
+        is_csv = (upload.filename or '').lower().endswith('.csv') or upload.mimetype == 'text/csv'
+    else:
+        stream = request.stream
+        is_csv = request.mimetype == 'text/csv'
+
+    result = import_content(
+        content_type,
+        read_import_rows(stream, 'csv' if is_csv else 'ndjson'),
+        strict=arg_flag('strict'),
+        dry_run=arg_flag('dry_run')
+    )
+    status = 201 if result['imported'] else (400 if result['errors'] else 200)
+    return jsonify(result), status
+
+
+@app.cli.command('import-content')
+@click.argument('content_type', type=click.Choice(sorted(IMPORT_SPECS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--strict', is_flag=True, help='Não grava nada se alguma linha for inválida')
+@click.option('--dry-run', is_flag=True, help='Apenas valida')
+def import_content_command(content_type, path, strict, dry_run):
+    """Importa um arquivo NDJSON ou CSV de palestras, exercícios ou estudos"""
+    fmt = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+    with open(path, 'rb') as f:
+        result = import_content(content_type, read_import_rows(f, fmt), strict=strict, dry_run=dry_run,
+                                sync=True)
+    for error in result['errors']:
+        click.echo(f"linha {error['line']}: {error['error']}", err=True)
+    click.echo(f"Válidas: {result['valid']}  Importadas: {result['imported']}  Erros: {len(result['errors'])}")
+
+
 # ========================================
 # ENDPOINTS DE AUTENTICAÇÃO
 # ========================================
@@ -1108,7 +3734,10 @@ def login():
     if user['role'] == 'pending':
         return jsonify({'error': 'Usuário aguardando aprovação'}), 403
 
+    # Sessão permanente: expira após SESSION_LIFETIME em qualquer backend
+    session.permanent = True
     session['user_id'] = user['id']
+    session.pop('user', None)
     return jsonify({
         'id': user['id'],
         'username': user['username'],
@@ -1122,6 +3751,7 @@ def login():
 def logout():
     """Endpoint de logout"""
     session.pop('user_id', None)
+    session.pop('user', None)
     return jsonify({'message': 'Logout realizado'})
 
 
@@ -1149,7 +3779,7 @@ def get_pending_users():
                instituicao, area_pesquisa, lattes, tipo_vinculo, created_at
         FROM auth_users WHERE role = 'pending'
     """)
-    return jsonify([serialize_row(u) for u in pending])
+    return jsonify(pending)
 
 
 @app.route('/api/auth/approve-user', methods=['POST'])
@@ -1176,6 +3806,7 @@ def approve_user():
         SET role = %s, password = %s, approved_at = %s, approved_by = %s
         WHERE id = %s
     """, (role, hashed, datetime.now().isoformat(), current_user['id'], user_id))
+    forget_user(user_id)
 
     return jsonify({
         'message': 'Usuário aprovado',
@@ -1191,17 +3822,126 @@ def reject_user():
     data = request.json
     user_id = data.get('user_id')
     execute("DELETE FROM auth_users WHERE id = %s", (user_id,))
+    forget_user(user_id)
     return jsonify({'message': 'Usuário rejeitado e removido'})
 
 
-# Servir arquivos estáticos do frontend (produção)
+# ========================================
+# ARQUIVOS ESTÁTICOS
+# ========================================
+
+class StaticAsset:
+    __slots__ = ('variants', 'mimetype', 'cache_control', 'etag')
+
+    def __init__(self, variants, mimetype, cache_control, etag):
+        self.variants = variants  # encoding -> bytes; None = sem compressão (None se lido do disco)
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.etag = etag
+
+
+class StaticAssets:
+    """Manifesto em memória do build do Vite, montado uma vez por worker.
+
+    Arquivos compressíveis guardam as variantes gzip/brotli prontas (usa os
+    .gz/.br gerados no build quando existirem), então servir um asset não toca
+    o disco nem comprime nada.
+    """
+
+    COMPRESSIBLE = {'.html', '.js', '.mjs', '.css', '.svg', '.json', '.map', '.txt', '.xml', '.ico', '.webmanifest'}
+    MIN_COMPRESS_BYTES = 512
+    # Vite gera assets/<nome>-<hash>.<ext>
+    HASHED = re.compile(r'^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.files = {}
+
+    def load(self):
+        files = {}
+        if (self.root / 'index.html').is_file():
+            for file in self.root.rglob('*'):
+                if file.is_file() and file.suffix not in ('.gz', '.br'):
+                    rel = file.relative_to(self.root).as_posix()
+                    files[rel] = self._build(file, rel)
+        self.files = files
+        return len(files)
+
+    def _build(self, file, rel):
+        if rel == 'index.html':
+            cache_control = STATIC_INDEX_CACHE_CONTROL
+        elif self.HASHED.match(rel):
+            cache_control = STATIC_IMMUTABLE_CACHE_CONTROL
+        else:
+            cache_control = STATIC_CACHE_CONTROL
+        mimetype = mimetypes.guess_type(rel)[0] or 'application/octet-stream'
+
+        if file.stat().st_size > STATIC_MAX_INLINE_BYTES:
+            stat = file.stat()
+            return StaticAsset({None: None}, mimetype, cache_control, f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+
+        body = file.read_bytes()
+        variants = {None: body}
+        if file.suffix in self.COMPRESSIBLE and len(body) >= self.MIN_COMPRESS_BYTES:
+            for encoding, suffix, compress in (
+                ('br', '.br', brotli and (lambda b: brotli.compress(b, quality=11))),
+                ('gzip', '.gz', lambda b: gzip.compress(b, 9, mtime=0)),
+            ):
+                prebuilt = file.with_name(file.name + suffix)
+                if prebuilt.is_file():
+                    data = prebuilt.read_bytes()
+                elif compress:
+                    data = compress(body)
+                else:
+                    continue
+                if len(data) < len(body):
+                    variants[encoding] = data
+        return StaticAsset(variants, mimetype, cache_control, hashlib.sha1(body).hexdigest()[:20])
+
+    def response(self, path):
+        """Response para `path` do manifesto, ou None se não existir"""
+        asset = self.files.get(path)
+        if asset is None:
+            return None
+        encoding = negotiate_encoding(asset.variants) if len(asset.variants) > 1 else None
+        etag = f"{asset.etag}-{encoding}" if encoding else asset.etag
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        elif asset.variants[None] is None:
+            response = send_from_directory(self.root, path, mimetype=asset.mimetype, etag=False)
+        else:
+            response = Response(asset.variants[encoding], mimetype=asset.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = asset.cache_control
+        if len(asset.variants) > 1:
+            response.vary.add('Accept-Encoding')
+        return response
+
+
+# Só em produção: em desenvolvimento STATIC_PATH é a raiz do projeto
+static_assets = StaticAssets(STATIC_PATH) if IS_PRODUCTION else None
+if static_assets is not None:
+    logging.info("Manifesto de estáticos: %d arquivos", static_assets.load())
+
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve_frontend(path):
-    """Serve o frontend React buildado"""
+    """Serve o frontend React buildado (rotas do SPA recebem o index.html)"""
     if path.startswith('api/'):
         return jsonify({"error": "Not found"}), 404
 
+    if static_assets is not None and static_assets.files:
+        response = static_assets.response(path or 'index.html')
+        if response is None:
+            if path.startswith('assets/'):
+                return "Not found", 404
+            response = static_assets.response('index.html')
+        return response
+
     if path and (STATIC_PATH / path).exists():
         return send_from_directory(STATIC_PATH, path)
 
@@ -1211,6 +3951,8 @@ def serve_frontend(path):
 if __name__ == '__main__':
     print(f"PostgreSQL: {DB_CONFIG['dbname']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}")
     print(f"Env: {'production' if IS_PRODUCTION else 'development'}")
+    if DB_AUTO_MIGRATE:
+        apply_migrations()
     port = int(os.getenv('PORT', 5000))
     app.run(
         debug=not IS_PRODUCTION,
@@ -0,0 +1,31 @@
+-- Índices secundários para os filtros, joins e ordenações usados em app.py.
+
+-- Traduções: join por master_id + idioma e listagens ordenadas por data
+CREATE INDEX IF NOT EXISTS blog_blog_translation_master_lang_idx
+    ON public.blog_blog_translation (master_id, language_code);
+CREATE INDEX IF NOT EXISTS blog_blog_translation_lang_date_idx
+    ON public.blog_blog_translation (language_code, date_time DESC, master_id DESC);
+
+-- Filhos de blog_blog (vídeos e arquivos)
+CREATE INDEX IF NOT EXISTS blog_lecturevideo_blog_post_id_idx
+    ON public.blog_lecturevideo (blog_post_id);
+CREATE INDEX IF NOT EXISTS blog_lecturefile_blog_post_id_idx
+    ON public.blog_lecturefile (blog_post_id);
+
+-- Listagens de exercícios e estudos (filtro + ordenação por data, id)
+CREATE INDEX IF NOT EXISTS exercicios_subcategory_published_idx
+    ON public.exercicios (subcategory, published_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS exercicios_published_idx
+    ON public.exercicios (published_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS estudos_published_idx
+    ON public.estudos (published_date DESC, id DESC);
+
+-- Login, cadastro e aprovação
+CREATE INDEX IF NOT EXISTS auth_users_email_idx
+    ON public.auth_users (email);
+CREATE INDEX IF NOT EXISTS auth_users_role_idx
+    ON public.auth_users (role);
+
+-- Contagem de usuários por tipo em /api/stats
+CREATE INDEX IF NOT EXISTS users_customuser_type_idx
+    ON public.users_customuser (type_of_person_id);
@@ -0,0 +1,10 @@
+-- Índices full-text (português) usados por /api/search.
+-- As expressões precisam ser idênticas às de SEARCH_TSV em app.py.
+
+CREATE INDEX IF NOT EXISTS blog_blog_translation_search_idx ON public.blog_blog_translation USING gin ((setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || setweight(to_tsvector('portuguese', coalesce(resume_speaker, '') || ' ' || coalesce(affiliation, '')), 'B') || setweight(to_tsvector('portuguese', coalesce(body, '')), 'C')));
+
+CREATE INDEX IF NOT EXISTS exercicios_search_idx ON public.exercicios USING gin ((setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || setweight(to_tsvector('portuguese', coalesce(description, '') || ' ' || coalesce(instructor, '')), 'B') || setweight(to_tsvector('portuguese', coalesce(body, '')), 'C')));
+
+CREATE INDEX IF NOT EXISTS estudos_search_idx ON public.estudos USING gin ((setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || setweight(to_tsvector('portuguese', coalesce(description, '') || ' ' || coalesce(author, '')), 'B') || setweight(to_tsvector('portuguese', coalesce(body, '')), 'C')));
+
+CREATE INDEX IF NOT EXISTS pages_page_translation_search_idx ON public.pages_page_translation USING gin ((setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || setweight(to_tsvector('portuguese', coalesce(summary, '')), 'B') || setweight(to_tsvector('portuguese', coalesce(body, '')), 'C')));
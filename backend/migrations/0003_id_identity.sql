@@ -0,0 +1,16 @@
+-- Substitui o padrão COALESCE(MAX(id), 0) + 1 por colunas identity.
+-- As sequências começam após o maior id existente.
+
+ALTER TABLE public.blog_blog ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+ALTER TABLE public.blog_blog_translation ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+ALTER TABLE public.blog_lecturevideo ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+ALTER TABLE public.blog_lecturefile ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+ALTER TABLE public.exercicios ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+ALTER TABLE public.estudos ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+
+SELECT setval(pg_get_serial_sequence('public.blog_blog', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM public.blog_blog;
+SELECT setval(pg_get_serial_sequence('public.blog_blog_translation', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM public.blog_blog_translation;
+SELECT setval(pg_get_serial_sequence('public.blog_lecturevideo', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM public.blog_lecturevideo;
+SELECT setval(pg_get_serial_sequence('public.blog_lecturefile', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM public.blog_lecturefile;
+SELECT setval(pg_get_serial_sequence('public.exercicios', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM public.exercicios;
+SELECT setval(pg_get_serial_sequence('public.estudos', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM public.estudos;
@@ -0,0 +1,21 @@
+-- Resumo das contagens de /api/stats e /api/conteudos/stats numa única linha.
+-- Atualizado com REFRESH MATERIALIZED VIEW CONCURRENTLY (ver refresh_content_stats em app.py).
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.content_stats AS
+SELECT
+    1 AS id,
+    (SELECT COUNT(*) FROM public.users_customuser) AS total_usuarios,
+    (SELECT COUNT(*) FROM public.blog_lecturevideo) AS total_videos,
+    (SELECT COUNT(DISTINCT master_id) FROM public.blog_blog_translation WHERE master_id IS NOT NULL) AS total_palestras,
+    (SELECT COUNT(*) FROM public.exercicios) AS total_exercicios,
+    (SELECT COUNT(*) FROM public.estudos) AS total_estudos,
+    (SELECT COUNT(*) FROM public.blog_lecturefile) AS total_cartilhas,
+    (SELECT COALESCE(jsonb_object_agg(name, cnt), '{}'::jsonb)
+       FROM (SELECT ut.name, COUNT(uc.id) AS cnt
+               FROM public.users_type ut
+               LEFT JOIN public.users_customuser uc ON uc.type_of_person_id = ut.id
+              GROUP BY ut.name) per_type) AS usuarios_por_tipo,
+    now() AS generated_at;
+
+-- Necessário para REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS content_stats_id_idx ON public.content_stats (id);
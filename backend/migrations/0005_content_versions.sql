@@ -0,0 +1,12 @@
+-- Versão por tipo de conteúdo, incrementada pelos handlers de escrita.
+-- Base dos ETags / Last-Modified das rotas públicas.
+
+CREATE TABLE IF NOT EXISTS public.content_versions (
+    kind text PRIMARY KEY,
+    version bigint NOT NULL DEFAULT 0,
+    updated_at timestamp with time zone NOT NULL DEFAULT now()
+);
+
+INSERT INTO public.content_versions (kind)
+VALUES ('palestras'), ('cartilhas'), ('exercicios'), ('estudos'), ('pages'), ('stats')
+ON CONFLICT (kind) DO NOTHING;
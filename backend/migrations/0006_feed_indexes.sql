@@ -0,0 +1,28 @@
+-- Índices parciais que casam com os ramos de /api/latest-videos, permitindo
+-- que cada ramo do UNION ALL leia apenas as `limit` linhas mais recentes.
+
+CREATE INDEX IF NOT EXISTS exercicios_videos_published_idx
+    ON public.exercicios (published_date DESC NULLS LAST)
+    WHERE mockup = false AND video_url IS NOT NULL AND video_url <> '';
+
+CREATE INDEX IF NOT EXISTS estudos_videos_published_idx
+    ON public.estudos (published_date DESC NULLS LAST)
+    WHERE mockup = false AND content_type = 'video';
+
+-- O feed e a paginação por cursor ordenam por data DESC NULLS LAST; os índices
+-- de 0001 (DESC = NULLS FIRST) não servem para essa ordem.
+DROP INDEX IF EXISTS public.blog_blog_translation_lang_date_idx;
+CREATE INDEX blog_blog_translation_lang_date_idx
+    ON public.blog_blog_translation (language_code, date_time DESC NULLS LAST, master_id DESC);
+
+DROP INDEX IF EXISTS public.exercicios_subcategory_published_idx;
+CREATE INDEX exercicios_subcategory_published_idx
+    ON public.exercicios (subcategory, published_date DESC NULLS LAST, id DESC);
+
+DROP INDEX IF EXISTS public.exercicios_published_idx;
+CREATE INDEX exercicios_published_idx
+    ON public.exercicios (published_date DESC NULLS LAST, id DESC);
+
+DROP INDEX IF EXISTS public.estudos_published_idx;
+CREATE INDEX estudos_published_idx
+    ON public.estudos (published_date DESC NULLS LAST, id DESC);
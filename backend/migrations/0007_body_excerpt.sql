@@ -0,0 +1,11 @@
+-- Resumo em texto puro do body (HTML), usado no campo `excerpt` das listagens
+-- no lugar do body completo.
+
+ALTER TABLE public.blog_blog_translation ADD COLUMN IF NOT EXISTS body_excerpt text
+    GENERATED ALWAYS AS (left(btrim(regexp_replace(regexp_replace(coalesce(body, ''), '<[^>]+>', ' ', 'g'), '\s+', ' ', 'g')), 280)) STORED;
+
+ALTER TABLE public.exercicios ADD COLUMN IF NOT EXISTS body_excerpt text
+    GENERATED ALWAYS AS (left(btrim(regexp_replace(regexp_replace(coalesce(body, ''), '<[^>]+>', ' ', 'g'), '\s+', ' ', 'g')), 280)) STORED;
+
+ALTER TABLE public.estudos ADD COLUMN IF NOT EXISTS body_excerpt text
+    GENERATED ALWAYS AS (left(btrim(regexp_replace(regexp_replace(coalesce(body, ''), '<[^>]+>', ' ', 'g'), '\s+', ' ', 'g')), 280)) STORED;
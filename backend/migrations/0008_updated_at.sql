@@ -0,0 +1,27 @@
+-- updated_at mantido por trigger, usado pelo filtro updated_since de /api/export.
+
+CREATE OR REPLACE FUNCTION public.set_updated_at() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END
+$$;
+
+ALTER TABLE public.blog_blog ADD COLUMN IF NOT EXISTS updated_at timestamp with time zone NOT NULL DEFAULT now();
+ALTER TABLE public.exercicios ADD COLUMN IF NOT EXISTS updated_at timestamp with time zone NOT NULL DEFAULT now();
+ALTER TABLE public.estudos ADD COLUMN IF NOT EXISTS updated_at timestamp with time zone NOT NULL DEFAULT now();
+
+DROP TRIGGER IF EXISTS blog_blog_set_updated_at ON public.blog_blog;
+CREATE TRIGGER blog_blog_set_updated_at BEFORE UPDATE ON public.blog_blog
+    FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+DROP TRIGGER IF EXISTS exercicios_set_updated_at ON public.exercicios;
+CREATE TRIGGER exercicios_set_updated_at BEFORE UPDATE ON public.exercicios
+    FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+DROP TRIGGER IF EXISTS estudos_set_updated_at ON public.estudos;
+CREATE TRIGGER estudos_set_updated_at BEFORE UPDATE ON public.estudos
+    FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+CREATE INDEX IF NOT EXISTS blog_blog_updated_at_idx ON public.blog_blog (updated_at);
+CREATE INDEX IF NOT EXISTS exercicios_updated_at_idx ON public.exercicios (updated_at);
+CREATE INDEX IF NOT EXISTS estudos_updated_at_idx ON public.estudos (updated_at);
@@ -0,0 +1,9 @@
+-- Armazenamento de sessões no PostgreSQL (SESSION_BACKEND=postgres).
+
+CREATE TABLE IF NOT EXISTS public.http_sessions (
+    sid text PRIMARY KEY,
+    data jsonb NOT NULL DEFAULT '{}'::jsonb,
+    expires_at timestamp with time zone NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS http_sessions_expires_at_idx ON public.http_sessions (expires_at);
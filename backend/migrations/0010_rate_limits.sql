@@ -0,0 +1,12 @@
+-- Contadores do rate limiter (LIMITER_STORAGE_URI=amparo+postgres://).
+-- UNLOGGED: perder os contadores num crash do banco é aceitável.
+
+CREATE UNLOGGED TABLE IF NOT EXISTS public.rate_limits (
+    key text NOT NULL,
+    bucket bigint NOT NULL,
+    count integer NOT NULL,
+    expires_at double precision NOT NULL,
+    PRIMARY KEY (key, bucket)
+);
+
+CREATE INDEX IF NOT EXISTS rate_limits_expires_at_idx ON public.rate_limits (expires_at);
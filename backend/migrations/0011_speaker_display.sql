@@ -0,0 +1,4 @@
+-- Nome de exibição do palestrante, calculado pela aplicação na escrita
+-- (extract_speaker_info). Linhas existentes: `flask backfill-speakers`.
+
+ALTER TABLE public.blog_blog ADD COLUMN IF NOT EXISTS speaker_display text;
@@ -0,0 +1,12 @@
+-- Os ramos de /api/latest-videos paginam por (data, id): o id entra nos índices
+-- parciais de 0006 para que o seek e o desempate continuem só no índice.
+
+DROP INDEX IF EXISTS public.exercicios_videos_published_idx;
+CREATE INDEX exercicios_videos_published_idx
+    ON public.exercicios (published_date DESC NULLS LAST, id DESC)
+    WHERE mockup = false AND video_url IS NOT NULL AND video_url <> '';
+
+DROP INDEX IF EXISTS public.estudos_videos_published_idx;
+CREATE INDEX estudos_videos_published_idx
+    ON public.estudos (published_date DESC NULLS LAST, id DESC)
+    WHERE mockup = false AND content_type = 'video';
@@ -0,0 +1,31 @@
+-- Alterações em traduções, vídeos e arquivos tocam blog_blog.updated_at,
+-- para que o export incremental (updated_since) das palestras e cartilhas as veja.
+-- O argumento do trigger é a coluna que aponta para blog_blog.
+
+CREATE OR REPLACE FUNCTION public.touch_blog_blog() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    parent_ids integer[] := '{}';
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        parent_ids := parent_ids || (to_jsonb(OLD) ->> TG_ARGV[0])::integer;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        parent_ids := parent_ids || (to_jsonb(NEW) ->> TG_ARGV[0])::integer;
+    END IF;
+    -- Uma vez por transação: replace_children apaga e reinsere várias linhas
+    UPDATE public.blog_blog SET updated_at = now()
+    WHERE id = ANY (parent_ids) AND updated_at IS DISTINCT FROM now();
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS blog_blog_translation_touch_blog ON public.blog_blog_translation;
+CREATE TRIGGER blog_blog_translation_touch_blog AFTER INSERT OR UPDATE OR DELETE ON public.blog_blog_translation
+    FOR EACH ROW EXECUTE FUNCTION public.touch_blog_blog('master_id');
+DROP TRIGGER IF EXISTS blog_lecturevideo_touch_blog ON public.blog_lecturevideo;
+CREATE TRIGGER blog_lecturevideo_touch_blog AFTER INSERT OR UPDATE OR DELETE ON public.blog_lecturevideo
+    FOR EACH ROW EXECUTE FUNCTION public.touch_blog_blog('blog_post_id');
+DROP TRIGGER IF EXISTS blog_lecturefile_touch_blog ON public.blog_lecturefile;
+CREATE TRIGGER blog_lecturefile_touch_blog AFTER INSERT OR UPDATE OR DELETE ON public.blog_lecturefile
+    FOR EACH ROW EXECUTE FUNCTION public.touch_blog_blog('blog_post_id');
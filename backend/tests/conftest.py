@@ -0,0 +1,63 @@
+"""Fixtures dos testes do backend.
+
+Os testes que usam o banco rodam só quando AMPARO_TEST_DB aponta para um banco
+descartável carregado com o init.sql (as migrações e o backfill de
+speaker_display são aplicados aqui):
+
+    createdb amparo_test && psql -d amparo_test -f init.sql
+    AMPARO_TEST_DB=amparo_test python -m pytest backend/tests
+
+As demais variáveis DB_* (host, usuário, senha) são as mesmas do backend.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix='amparo-tests-')
+TEST_DB = os.environ.get('AMPARO_TEST_DB')
+if TEST_DB:
+    os.environ['DB_NAME'] = TEST_DB
+os.environ['SHARED_CACHE_PATH'] = os.path.join(_tmp, 'cache.sqlite3')
+os.environ['METRICS_PATH'] = os.path.join(_tmp, 'metrics.sqlite3')
+os.environ['LIMITER_STORAGE_URI'] = 'memory://'
+os.environ['RATELIMIT_ENABLED'] = '0'
+os.environ['STATS_REFRESH_INTERVAL'] = '0'
+os.environ['DB_AUTO_MIGRATE'] = '0'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as amparo  # noqa: E402
+
+EDITOR = {'id': 1, 'username': 'editor', 'email': 'editor@example.com', 'role': 'editor', 'nome': 'Editor'}
+
+
+@pytest.fixture(scope='session')
+def database():
+    """Banco de teste migrado; pula o teste se AMPARO_TEST_DB não estiver definido"""
+    if not TEST_DB:
+        pytest.skip('AMPARO_TEST_DB não definido')
+    amparo.apply_migrations()
+    with amparo.app.app_context():
+        amparo.backfill_speaker_display()
+    return TEST_DB
+
+
+@pytest.fixture
+def client():
+    amparo.response_cache.clear()
+    amparo.content_versions.clear()
+    return amparo.app.test_client()
+
+
+@pytest.fixture
+def db_client(database, client):
+    return client
+
+
+@pytest.fixture
+def editor(monkeypatch):
+    """Autentica as requisições como editor"""
+    monkeypatch.setattr(amparo, 'get_current_user', lambda: dict(EDITOR))
+    return EDITOR
@@ -0,0 +1,111 @@
+"""ResponseCache (LRU, TTL, limite de bytes, tags) e invalidação após escritas"""
+import time
+
+import app as amparo
+
+EXERCICIO = {'title': 'Alongamento de teste', 'description': 'd', 'instructor': 'i', 'body': '<p>b</p>'}
+
+
+def make_cache(**kwargs):
+    options = {'ttl': 60, 'max_entries': 10, 'max_bytes': 1000}
+    options.update(kwargs)
+    return amparo.ResponseCache(**options)
+
+
+def test_get_returns_stored_entry():
+    cache = make_cache()
+    cache.set('/a', b'body', 200, 'application/json', ('x',))
+    assert cache.get('/a').body == b'body'
+    assert cache.get('/b') is None
+
+
+def test_expired_entry_is_a_miss():
+    cache = make_cache(ttl=0.01)
+    cache.set('/a', b'body', 200, 'application/json', ('x',))
+    time.sleep(0.02)
+    assert cache.get('/a') is None
+    assert cache.snapshot()['entries'] == 0
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = make_cache(max_entries=2)
+    cache.set('/a', b'a', 200, 'application/json', ())
+    cache.set('/b', b'b', 200, 'application/json', ())
+    cache.get('/a')
+    cache.set('/c', b'c', 200, 'application/json', ())
+    assert cache.get('/a') is not None
+    assert cache.get('/b') is None
+    assert cache.get('/c') is not None
+
+
+def test_byte_limit_evicts_entries():
+    cache = make_cache(max_bytes=1000)
+    for n in range(6):
+        cache.set(f'/{n}', b'x' * 200, 200, 'application/json', ())
+    assert cache.snapshot()['bytes'] <= 1000
+    assert cache.get('/0') is None
+
+
+def test_compressed_variants_count_against_byte_limit():
+    cache = make_cache(max_bytes=1000)
+    for n in range(4):
+        entry = cache.set(f'/{n}', b'x' * 200, 200, 'application/json', ())
+        cache.add_variant(f'/{n}', entry, 'gzip', b'z' * 100)
+        cache.add_variant(f'/{n}', entry, 'br', b'b' * 100)
+    assert cache.snapshot()['bytes'] <= 1000
+    assert cache.get('/0') is None
+    assert cache.get('/3').variants == {'gzip': b'z' * 100, 'br': b'b' * 100}
+
+
+def test_invalidate_removes_only_tagged_entries():
+    cache = make_cache()
+    cache.set('/a', b'a', 200, 'application/json', ('palestras',))
+    cache.set('/b', b'b', 200, 'application/json', ('exercicios',))
+    cache.invalidate('palestras')
+    assert cache.get('/a') is None
+    assert cache.get('/b') is not None
+
+
+def test_set_with_stale_generation_is_dropped():
+    cache = make_cache()
+    generation = cache.generation(('palestras',))
+    cache.invalidate('palestras')
+    cache.set('/a', b'a', 200, 'application/json', ('palestras',), generation=generation)
+    assert cache.get('/a') is None
+
+
+def test_list_reflects_writes(db_client, editor):
+    path = '/api/conteudos/exercicios'
+    query = {'per_page': 1000}
+    assert db_client.get(path, query_string=query).headers['X-Cache'] == 'MISS'
+    assert db_client.get(path, query_string=query).headers['X-Cache'] == 'HIT'
+
+    new_id = db_client.post(path, json=EXERCICIO).get_json()['id']
+    try:
+        response = db_client.get(path, query_string=query)
+        assert response.headers['X-Cache'] == 'MISS'
+        assert new_id in [e['id'] for e in response.get_json()['exercicios']]
+
+        assert db_client.get(f'{path}/{new_id}').get_json()['title'] == EXERCICIO['title']
+        db_client.put(f'{path}/{new_id}', json=dict(EXERCICIO, title='Alongamento alterado'))
+        detail = db_client.get(f'{path}/{new_id}').get_json()
+        assert detail['title'] == 'Alongamento alterado'
+    finally:
+        db_client.delete(f'{path}/{new_id}')
+
+    response = db_client.get(path, query_string=query)
+    assert new_id not in [e['id'] for e in response.get_json()['exercicios']]
+
+
+def test_other_workers_do_not_serve_stale_shared_entries(db_client, editor):
+    path = '/api/conteudos/exercicios'
+    db_client.get(path)
+    amparo.response_cache.clear()
+    assert db_client.get(path).headers['X-Cache'] == 'HIT-SHARED'
+
+    new_id = db_client.post(path, json=EXERCICIO).get_json()['id']
+    try:
+        amparo.response_cache.clear()
+        assert db_client.get(path).headers['X-Cache'] == 'MISS'
+    finally:
+        db_client.delete(f'{path}/{new_id}')
@@ -0,0 +1,41 @@
+"""ChildLoader: vídeos/arquivos de vários pais numa query, cada pai buscado uma vez"""
+import pytest
+
+import app as amparo
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    calls = []
+
+    def query_all(sql, params=None, conn=None):
+        parent_ids = params[0]
+        calls.append(sorted(parent_ids))
+        return [{'id': pid * 10, 'video': f'v{pid}', 'blog_post_id': pid} for pid in parent_ids if pid % 2]
+
+    monkeypatch.setattr(amparo, 'query_all', query_all)
+    return calls
+
+
+def test_load_many_batches_and_memoizes(queries):
+    loader = amparo.ChildLoader()
+    first = loader.load_many('videos', [1, 2, 3])
+    assert first[1][0]['video'] == 'v1' and first[2] == []
+    second = loader.load_many('videos', [3, 4, 5])
+    assert [v['video'] for v in second[5]] == ['v5']
+    assert queries == [[1, 2, 3], [4, 5]]
+
+
+def test_primed_parents_are_not_queried(queries):
+    loader = amparo.ChildLoader()
+    loader.prime('videos', [7], [{'id': 1, 'video': 'x', 'blog_post_id': 7}])
+    assert loader.load('videos', 7)[0]['video'] == 'x'
+    assert queries == []
+
+
+def test_loader_is_per_request():
+    with amparo.app.test_request_context('/'):
+        loader = amparo.child_loader()
+        assert amparo.child_loader() is loader
+    with amparo.app.test_request_context('/'):
+        assert amparo.child_loader() is not loader
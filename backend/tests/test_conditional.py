@@ -0,0 +1,66 @@
+"""ETag/Last-Modified, respostas 304 e a cópia local de content_versions"""
+from datetime import datetime
+
+import app as amparo
+
+EXERCICIO = {'title': 'Exercício condicional', 'description': 'd', 'body': '<p>b</p>'}
+
+
+def fake_versions(monkeypatch, version, during_query=None):
+    def query_all(sql, params=None, conn=None):
+        if during_query:
+            during_query()
+        return [{'kind': kind, 'version': version, 'updated_at': datetime(2025, 1, 1)} for kind in params[0]]
+    monkeypatch.setattr(amparo, 'query_all', query_all)
+
+
+def test_versions_are_cached_until_forgotten(monkeypatch):
+    versions = amparo.ContentVersions(max_entries=10)
+    fake_versions(monkeypatch, 1)
+    assert versions.get(('palestras',))['palestras'][0] == 1
+    fake_versions(monkeypatch, 2)
+    assert versions.get(('palestras',))['palestras'][0] == 1
+    versions.forget('palestras')
+    assert versions.get(('palestras',))['palestras'][0] == 2
+
+
+def test_read_racing_forget_is_not_stored(monkeypatch):
+    versions = amparo.ContentVersions(max_entries=10)
+    fake_versions(monkeypatch, 1, during_query=lambda: versions.forget('palestras'))
+    versions.get(('palestras',))
+    fake_versions(monkeypatch, 2)
+    assert versions.get(('palestras',))['palestras'][0] == 2
+
+
+def test_read_racing_clear_is_not_stored(monkeypatch):
+    versions = amparo.ContentVersions(max_entries=10)
+    fake_versions(monkeypatch, 1, during_query=versions.clear)
+    versions.get(('palestras',))
+    fake_versions(monkeypatch, 2)
+    assert versions.get(('palestras',))['palestras'][0] == 2
+
+
+def test_versions_are_bounded(monkeypatch):
+    versions = amparo.ContentVersions(max_entries=3)
+    fake_versions(monkeypatch, 1)
+    for n in range(10):
+        versions.get((f'user:{n}',))
+        versions.forget(f'user:{n + 100}')
+    assert len(versions._versions) == 3
+    assert len(versions._generations) <= 3
+
+
+def test_conditional_get_answers_304_until_content_changes(db_client, editor):
+    path = '/api/conteudos/exercicios'
+    first = db_client.get(path)
+    etag = first.headers['ETag']
+    assert etag
+    assert db_client.get(path, headers={'If-None-Match': etag}).status_code == 304
+
+    new_id = db_client.post(path, json=EXERCICIO).get_json()['id']
+    try:
+        changed = db_client.get(path, headers={'If-None-Match': etag})
+        assert changed.status_code == 200
+        assert changed.headers['ETag'] != etag
+    finally:
+        db_client.delete(f'{path}/{new_id}')
@@ -0,0 +1,102 @@
+"""Importação em lote (COPY + merge) e exportação NDJSON"""
+import json
+from datetime import datetime, timedelta
+
+import app as amparo
+
+MARKER = 'import-test-'
+
+
+def cleanup():
+    with amparo.app.app_context():
+        amparo.execute("DELETE FROM exercicios WHERE title LIKE %s", (MARKER + '%',))
+
+
+def test_import_then_export(db_client, editor, monkeypatch):
+    monkeypatch.setattr(amparo, 'QUERY_STATS_TOP', 10)
+    since = (datetime.now() - timedelta(minutes=1)).isoformat()
+    body = '\n'.join(json.dumps({'title': f'{MARKER}{n}', 'tags': ['a', 'b']}) for n in range(3))
+    try:
+        response = db_client.post('/api/import/exercicios', data=body + '\n{"description": "sem título"}\n',
+                                  content_type='application/x-ndjson')
+        assert response.status_code == 201
+        result = response.get_json()
+        assert result['imported'] == 3
+        assert [e['line'] for e in result['errors']] == [4]
+        assert 'COPY import_staging' in response.headers['Server-Timing']
+
+        exported = db_client.get('/api/export/exercicios', query_string={'updated_since': since})
+        rows = [json.loads(line) for line in exported.get_data(as_text=True).splitlines()]
+        imported = [r for r in rows if r['title'].startswith(MARKER)]
+        assert sorted(r['title'] for r in imported) == [f'{MARKER}{n}' for n in range(3)]
+        assert all(r['tags'] == ['a', 'b'] for r in imported)
+    finally:
+        cleanup()
+
+
+def test_strict_import_writes_nothing_on_error(db_client, editor):
+    body = json.dumps({'title': f'{MARKER}strict'}) + '\n{"title": "x", "duration_minutes": "abc"}\n'
+    try:
+        response = db_client.post('/api/import/exercicios?strict=1', data=body,
+                                  content_type='application/x-ndjson')
+        assert response.status_code == 400
+        with amparo.app.app_context():
+            assert amparo.query_scalar("SELECT COUNT(*) FROM exercicios WHERE title LIKE %s",
+                                       (MARKER + '%',)) == 0
+    finally:
+        cleanup()
+
+
+def test_unknown_type_is_404(db_client, editor):
+    assert db_client.get('/api/export/nada').status_code == 404
+    assert db_client.post('/api/import/nada', data='').status_code == 404
+
+
+def test_false_flags_are_not_dry_run(db_client, editor):
+    body = json.dumps({'title': f'{MARKER}flag'}) + '\n'
+    try:
+        response = db_client.post('/api/import/exercicios?dry_run=0&strict=false', data=body,
+                                  content_type='application/x-ndjson')
+        assert response.status_code == 201
+        assert response.get_json()['imported'] == 1
+    finally:
+        cleanup()
+
+
+def test_cli_import_refreshes_stats_before_exiting(database, monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(amparo, 'refresh_content_stats', lambda: calls.append('refresh'))
+    monkeypatch.setattr(amparo.stats_refresher, 'request_refresh', lambda: calls.append('background'))
+    path = tmp_path / 'exercicios.ndjson'
+    path.write_text(json.dumps({'title': f'{MARKER}cli'}) + '\n')
+    try:
+        result = amparo.app.test_cli_runner().invoke(args=['import-content', 'exercicios', str(path)])
+        assert result.exit_code == 0, result.output
+        assert 'Importadas: 1' in result.output
+        assert calls == ['refresh']
+    finally:
+        cleanup()
+
+
+def test_child_changes_reach_incremental_export(db_client, editor):
+    palestra = {'title': f'{MARKER}palestra', 'content': '<p>c</p>', 'speaker': 'Fulana', 'videos': ['a']}
+    new_id = db_client.post('/api/conteudos/palestras', json=palestra).get_json()['id']
+    try:
+        with amparo.app.app_context():
+            since = amparo.query_scalar("SELECT now()").isoformat()
+            query = {'updated_since': since}
+            exported = db_client.get('/api/export/palestras', query_string=query).get_data(as_text=True)
+            assert new_id not in [json.loads(line)['id'] for line in exported.splitlines()]
+
+            amparo.execute("INSERT INTO blog_lecturevideo (video, blog_post_id) VALUES ('b', %s)", (new_id,))
+        exported = db_client.get('/api/export/palestras', query_string=query).get_data(as_text=True)
+        rows = [json.loads(line) for line in exported.splitlines()]
+        assert [r['videos'] for r in rows if r['id'] == new_id] == [['a', 'b']]
+    finally:
+        db_client.delete(f'/api/conteudos/palestras/{new_id}')
+
+
+def test_unencoded_offset_is_accepted(db_client, editor):
+    response = db_client.get('/api/export/exercicios?updated_since=2999-01-01T00:00:00+03:00')
+    assert response.status_code == 200
+    assert response.get_data() == b''
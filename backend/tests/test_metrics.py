@@ -0,0 +1,83 @@
+"""/metrics, snapshots dos workers e /api/health"""
+import json
+import time
+
+import app as amparo
+
+
+def make_metrics(tmp_path, ttl=60):
+    return amparo.Metrics(str(tmp_path / 'metrics.sqlite3'), flush_interval=0, snapshot_ttl=ttl)
+
+
+def write_snapshot(metrics, pid, value, updated, in_flight=1):
+    data = {'counters': [['amparo_http_requests_total', [], value]], 'histograms': [],
+            'gauges': [['amparo_http_requests_in_flight', [], in_flight]]}
+    metrics._conn().execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+                            (pid, json.dumps(data), updated))
+
+
+def collect(metrics):
+    counters, _, gauges = metrics.collect()
+    return (counters.get(('amparo_http_requests_total', ()), 0),
+            gauges.get(('amparo_http_requests_in_flight', ()), 0))
+
+
+def test_dead_workers_keep_counters_and_lose_gauges(tmp_path, monkeypatch):
+    metrics = make_metrics(tmp_path)
+    monkeypatch.setattr(metrics, 'snapshot', lambda: {'counters': [], 'histograms': [], 'gauges': []})
+    monkeypatch.setattr(amparo, '_process_alive', lambda pid: pid != 111)
+    write_snapshot(metrics, 111, 5, time.time(), in_flight=2)
+    write_snapshot(metrics, 222, 7, time.time() - 3600, in_flight=4)
+    write_snapshot(metrics, 333, 11, time.time(), in_flight=8)
+    assert collect(metrics) == (5 + 7 + 11, 8)
+    pids = [pid for pid, in metrics._conn().execute("SELECT pid FROM snapshots")]
+    assert 111 not in pids and metrics.ACCUMULATED_PID in pids
+    # Dobrar de novo não pode contar duas vezes
+    assert collect(metrics) == (5 + 7 + 11, 8)
+
+
+def test_reused_pid_folds_old_snapshot(tmp_path):
+    path = str(tmp_path / 'metrics.sqlite3')
+    old = amparo.Metrics(path, flush_interval=0, snapshot_ttl=60)
+    write_snapshot(old, amparo.os.getpid(), 99, time.time())
+    fresh = amparo.Metrics(path, flush_interval=0, snapshot_ttl=60)
+    conn = fresh._conn()
+    assert conn.execute("SELECT COUNT(*) FROM snapshots WHERE pid = ?", (amparo.os.getpid(),)).fetchone()[0] == 0
+    assert collect(fresh)[0] == 99
+
+
+def test_discard_folds_own_counters(tmp_path, monkeypatch):
+    metrics = make_metrics(tmp_path)
+    monkeypatch.setattr(metrics, 'snapshot', lambda: {
+        'counters': [['amparo_http_requests_total', [], 3]], 'histograms': [],
+        'gauges': [['amparo_http_requests_in_flight', [], 1]]})
+    metrics.flush(force=True)
+    metrics.discard()
+    pids = [pid for pid, in metrics._conn().execute("SELECT pid FROM snapshots")]
+    assert pids == [metrics.ACCUMULATED_PID]
+    other = amparo.Metrics(metrics.path, flush_interval=0, snapshot_ttl=60)
+    monkeypatch.setattr(other, 'snapshot', lambda: {'counters': [], 'histograms': [], 'gauges': []})
+    other._owner_pid = amparo.os.getpid()
+    assert collect(other) == (3, 0)
+
+
+def test_health_hides_internals_without_token(client, monkeypatch):
+    monkeypatch.setattr(amparo, 'METRICS_TOKEN', 'segredo')
+    body = client.get('/api/health').get_json()
+    assert body['status'] == 'ok'
+    assert 'pool' not in body and 'cache' not in body
+    body = client.get('/api/health', headers={'Authorization': 'Bearer segredo'}).get_json()
+    assert 'pool' in body and 'cache' in body
+
+
+def test_health_deep_zero_skips_db(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('consultou o banco')
+    monkeypatch.setattr(amparo, 'query_scalar', fail)
+    assert client.get('/api/health', query_string={'deep': '0'}).status_code == 200
+    assert client.get('/api/health', query_string={'deep': 'false'}).status_code == 200
+
+
+def test_metrics_requires_token(client, monkeypatch):
+    monkeypatch.setattr(amparo, 'METRICS_TOKEN', 'segredo')
+    assert client.get('/metrics').status_code == 401
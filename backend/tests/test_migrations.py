@@ -0,0 +1,21 @@
+"""Migrações: os índices de busca ficam só nas migrações, com as expressões de SEARCH_TSV"""
+from pathlib import Path
+
+import app as amparo
+
+INIT_SQL = Path(amparo.__file__).resolve().parent.parent / 'init.sql'
+
+
+def test_migrations_have_unique_versions():
+    versions = [version for version, _, _ in amparo.list_migrations()]
+    assert versions == sorted(set(versions))
+
+
+def test_search_indexes_match_search_expressions():
+    sql = (amparo.MIGRATIONS_PATH / '0002_search_indexes.sql').read_text(encoding='utf-8')
+    for expression in amparo.SEARCH_TSV.values():
+        assert f'USING gin ({expression})' in sql
+
+
+def test_init_sql_does_not_declare_search_indexes():
+    assert '_search_idx' not in INIT_SQL.read_text(encoding='utf-8')
@@ -0,0 +1,77 @@
+"""Paginação por cursor: percorrer todas as páginas devolve cada linha uma vez só"""
+import pytest
+
+import app as amparo
+
+
+def walk(client, path, key, **params):
+    """Segue next_cursor até o fim e retorna todos os itens"""
+    items, cursor = [], ''
+    for _ in range(1000):
+        response = client.get(path, query_string=dict(params, cursor=cursor))
+        assert response.status_code == 200
+        body = response.get_json()
+        items += body[key]
+        cursor = body['next_cursor']
+        if not cursor:
+            return items
+    raise AssertionError('paginação não terminou')
+
+
+def all_feed_rows():
+    with amparo.app.app_context():
+        return amparo.query_all(" UNION ALL ".join(
+            f"({source['sql']})" for source in amparo.LATEST_VIDEO_SOURCES.values()
+        ))
+
+
+@pytest.mark.parametrize('path,key', [
+    ('/api/conteudos/exercicios', 'exercicios'),
+    ('/api/conteudos/estudos', 'estudos'),
+    ('/api/conteudos/palestras', 'palestras'),
+])
+def test_list_cursor_reaches_every_row(db_client, path, key):
+    total = db_client.get(path).get_json()['total']
+    items = walk(db_client, path, key, per_page=5)
+    ids = [item['id'] for item in items]
+    assert len(ids) == len(set(ids)) == total
+
+
+@pytest.mark.parametrize('limit', [1, 6, 50])
+def test_latest_videos_cursor_reaches_every_row(db_client, limit):
+    expected = sorted((r['source'], r['id'], r['video_url'] or '') for r in all_feed_rows())
+    items = walk(db_client, '/api/latest-videos', 'videos', limit=limit)
+    assert sorted((v['source'], v['id'], v['video_url']) for v in items) == expected
+
+
+def test_latest_videos_cursor_reaches_rows_without_date(db_client, editor):
+    exercicio = {'title': 'Sem data', 'video_url': 'https://example.com/v', 'published_date': None}
+    new_id = db_client.post('/api/conteudos/exercicios', json=exercicio).get_json()['id']
+    try:
+        items = walk(db_client, '/api/latest-videos', 'videos', limit=6, source='exercicios')
+        assert ('exercicios', new_id) in [(v['source'], v['id']) for v in items]
+        assert items[-1]['date'] == ''
+    finally:
+        db_client.delete(f'/api/conteudos/exercicios/{new_id}')
+
+
+def test_latest_videos_without_cursor_is_a_list(db_client):
+    body = db_client.get('/api/latest-videos', query_string={'limit': 3}).get_json()
+    assert isinstance(body, list) and len(body) == 3
+
+
+def test_invalid_cursor_is_400(db_client):
+    assert db_client.get('/api/latest-videos', query_string={'cursor': 'nao-e-cursor'}).status_code == 400
+
+
+def test_feed_seek_skips_exhausted_branches():
+    token = amparo.encode_feed_cursor({'date': None, 'source': 'exercicios', 'key': 3})
+    assert amparo.feed_seek_condition('palestras', token) is None
+    assert amparo.feed_seek_condition('exercicios', token)[1] == [3]
+    assert amparo.feed_seek_condition('estudos', token) == ("AND published_date IS NULL", [])
+
+
+@pytest.mark.parametrize('flag,expected', [('1', True), ('true', True), ('0', False), ('false', False)])
+def test_with_total_is_parsed_as_a_flag(db_client, flag, expected):
+    body = db_client.get('/api/conteudos/estudos', query_string={'cursor': '', 'with_total': flag}).get_json()
+    assert ('total' in body) is expected
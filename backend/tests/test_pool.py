@@ -0,0 +1,62 @@
+"""Pool de conexões: limite, espera, devolução e contadores sob concorrência"""
+import threading
+
+import pytest
+
+import app as amparo
+
+
+@pytest.fixture
+def pool(database):
+    pool = amparo.ConnectionPool(amparo.DB_CONFIG, maxconn=2, timeout=0.1, max_lifetime=60, ping_after=30)
+    yield pool
+    while pool._idle:
+        pool._discard(pool._idle.pop()[0])
+
+
+def test_connections_are_reused(pool):
+    conn = pool.getconn()
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+    assert pool.snapshot()['connects'] == 1
+
+
+def test_exhausted_pool_raises_or_returns_none(pool):
+    held = [pool.getconn(), pool.getconn()]
+    assert pool.getconn(wait=False) is None
+    with pytest.raises(amparo.PoolExhausted):
+        pool.getconn()
+    for conn in held:
+        pool.putconn(conn)
+    stats = pool.snapshot()
+    assert stats['exhausted'] == 1 and stats['in_use'] == 0 and stats['idle'] == 2
+
+
+def test_open_transaction_is_rolled_back_on_return(pool):
+    conn = pool.getconn()
+    conn.autocommit = False
+    conn.cursor().execute("SELECT 1")
+    pool.putconn(conn)
+    conn.autocommit = True
+    assert conn.get_transaction_status() == amparo.psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+def test_counters_are_exact_under_concurrency(database):
+    pool = amparo.ConnectionPool(amparo.DB_CONFIG, maxconn=4, timeout=5, max_lifetime=60, ping_after=30)
+    rounds, threads = 50, 8
+
+    def worker():
+        for _ in range(rounds):
+            pool.putconn(pool.getconn())
+
+    running = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in running:
+        thread.start()
+    for thread in running:
+        thread.join()
+    stats = pool.snapshot()
+    assert stats['checkouts'] == rounds * threads
+    assert stats['in_use'] == 0
+    assert stats['connects'] == stats['idle'] <= 4
+    while pool._idle:
+        pool._discard(pool._idle.pop()[0])
@@ -0,0 +1,23 @@
+"""Projeção fields= das listagens: só as colunas pedidas são lidas"""
+import app as amparo
+
+
+def test_speaker_projection_skips_heavy_columns():
+    columns = amparo.select_list(amparo.PALESTRA_FIELDS, ['id', 'speaker'], always=('b.id', 't.date_time'))
+    assert 'resume_speaker' not in columns
+    assert 'affiliation' not in columns
+    assert 'body' not in columns
+
+
+def test_speaker_matches_detail(db_client):
+    listed = db_client.get('/api/palestras', query_string={'fields': 'speaker', 'per_page': 1000}).get_json()
+    assert listed['palestras']
+    for item in listed['palestras'][:20]:
+        assert set(item) == {'id', 'speaker'}
+        assert item['speaker'] == db_client.get(f"/api/palestras/{item['id']}").get_json()['speaker']
+
+
+def test_excerpt_replaces_body(db_client):
+    listed = db_client.get('/api/conteudos/exercicios', query_string={'fields': 'title,excerpt'}).get_json()
+    for item in listed['exercicios']:
+        assert set(item) == {'id', 'title', 'excerpt'}
@@ -0,0 +1,36 @@
+"""Instrumentação de queries: contagem por requisição e Server-Timing"""
+import app as amparo
+
+
+def test_stats_are_open_while_the_session_loads(client, monkeypatch):
+    seen = []
+    interface = amparo.app.session_interface
+    original = interface.open_session
+
+    def open_session(app, request):
+        seen.append(amparo.current_query_stats.get())
+        return original(app, request)
+
+    monkeypatch.setattr(interface, 'open_session', open_session)
+    client.get('/api/health')
+    assert seen and seen[0] is not None
+    assert amparo.current_query_stats.get() is None
+
+
+def test_timed_query_records_into_current_stats():
+    stats = amparo.QueryStats()
+    token = amparo.current_query_stats.set(stats)
+    try:
+        with amparo.timed_query("COPY x FROM STDIN"):
+            pass
+    finally:
+        amparo.current_query_stats.reset(token)
+    assert stats.count == 1
+    assert stats.slowest[0][1] == "COPY x FROM STDIN"
+
+
+def test_server_timing_counts_queries(db_client):
+    response = db_client.get('/api/conteudos/exercicios')
+    timing = response.headers['Server-Timing']
+    assert 'db;dur=' in timing
+    assert '0 queries' not in timing
@@ -0,0 +1,49 @@
+"""Storages do rate limiter compartilhados entre workers (SQLite e PostgreSQL)"""
+import threading
+import uuid
+
+import pytest
+
+import app as amparo
+
+
+@pytest.fixture(params=['sqlite', 'postgres'])
+def storage(request, tmp_path):
+    if request.param == 'sqlite':
+        return amparo.SQLiteRateLimitStorage(f"amparo+sqlite://{tmp_path / 'limits.sqlite3'}")
+    request.getfixturevalue('database')
+    return amparo.PostgresRateLimitStorage('amparo+postgres://')
+
+
+def test_moving_window_stops_at_limit(storage):
+    key = f'test/{uuid.uuid4()}'
+    assert [storage.acquire_entry(key, 3, 60) for _ in range(4)] == [True, True, True, False]
+    assert storage.get_moving_window(key, 3, 60)[1] == 3
+    storage.clear(key)
+    assert storage.acquire_entry(key, 3, 60)
+
+
+def test_fixed_window_counts(storage):
+    key = f'test/{uuid.uuid4()}'
+    assert [storage.incr(key, 60) for _ in range(3)] == [1, 2, 3]
+    assert storage.get(key) == 3
+    storage.clear(key)
+    assert storage.get(key) == 0
+
+
+def test_concurrent_acquires_never_exceed_limit(storage):
+    key = f'test/{uuid.uuid4()}'
+    granted = []
+
+    def worker():
+        for _ in range(10):
+            if storage.acquire_entry(key, 15, 60):
+                granted.append(1)
+
+    running = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in running:
+        thread.start()
+    for thread in running:
+        thread.join()
+    assert len(granted) == 15
+    storage.clear(key)
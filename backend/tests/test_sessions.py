@@ -0,0 +1,49 @@
+"""Sessões: login com validade limitada e logout revogando a sessão no servidor"""
+from datetime import datetime, timezone
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+import app as amparo
+
+
+@pytest.fixture
+def user(database):
+    with amparo.app.app_context():
+        row = amparo.execute("""
+            INSERT INTO auth_users (username, password, email, role, nome)
+            VALUES ('sessao-teste', %s, 'sessao@example.com', 'editor', 'Sessão')
+            RETURNING id
+        """, (generate_password_hash('senha-teste'),))
+    yield row['id']
+    with amparo.app.app_context():
+        amparo.execute("DELETE FROM auth_users WHERE id = %s", (row['id'],))
+
+
+def login(client):
+    return client.post('/api/auth/login', json={'username': 'sessao-teste', 'password': 'senha-teste'})
+
+
+def test_default_backend_is_server_side():
+    assert isinstance(amparo.app.session_interface, amparo.PostgresSessionInterface)
+
+
+def test_login_cookie_expires_with_session_lifetime(db_client, user):
+    response = login(db_client)
+    assert response.status_code == 200
+    cookie = db_client.get_cookie(amparo.app.config['SESSION_COOKIE_NAME'])
+    assert cookie.expires is not None
+    remaining = cookie.expires - datetime.now(timezone.utc)
+    assert remaining <= amparo.SESSION_LIFETIME
+
+
+def test_logout_revokes_the_session(db_client, user):
+    login(db_client)
+    name = amparo.app.config['SESSION_COOKIE_NAME']
+    sid = db_client.get_cookie(name).value
+    assert db_client.get('/api/auth/me').status_code == 200
+
+    db_client.post('/api/auth/logout')
+    # Um cookie capturado antes do logout não vale mais
+    db_client.set_cookie(name, sid)
+    assert db_client.get('/api/auth/me').status_code == 401
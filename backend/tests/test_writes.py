@@ -0,0 +1,66 @@
+"""Rotas de escrita: ids inexistentes respondem 404 e falhas no meio desfazem tudo"""
+import pytest
+
+import app as amparo
+
+MISSING_ID = 987654321
+
+PALESTRA = {'title': 'Teste', 'content': '<p>corpo</p>', 'speaker': 'Fulana', 'videos': ['abc']}
+
+
+@pytest.mark.parametrize('path', [
+    '/api/conteudos/palestras',
+    '/api/conteudos/cartilhas',
+    '/api/conteudos/exercicios',
+    '/api/conteudos/estudos',
+])
+def test_get_missing_id_is_404(db_client, path):
+    assert db_client.get(f'{path}/{MISSING_ID}').status_code == 404
+
+
+@pytest.mark.parametrize('path', [
+    '/api/conteudos/palestras',
+    '/api/conteudos/cartilhas',
+    '/api/conteudos/exercicios',
+    '/api/conteudos/estudos',
+])
+def test_put_missing_id_is_404(db_client, editor, path):
+    response = db_client.put(f'{path}/{MISSING_ID}', json=PALESTRA)
+    assert response.status_code == 404
+    assert 'error' in response.get_json()
+
+
+def test_delete_missing_cartilha_is_404(db_client, editor):
+    assert db_client.delete(f'/api/conteudos/cartilhas/{MISSING_ID}').status_code == 404
+
+
+def test_execute_returns_none_when_returning_matches_nothing(database):
+    with amparo.app.app_context():
+        row = amparo.execute("UPDATE blog_blog SET publish = publish WHERE id = %s RETURNING id", (MISSING_ID,))
+    assert row is None
+
+
+
+def palestra_rows(palestra_id):
+    """Estado gravado da palestra, lido direto do banco (sem os caches de resposta)"""
+    with amparo.app.app_context():
+        return amparo.query_all("""
+            SELECT b.speaker, b.speaker_display, b.updated_at, t.title, t.body,
+                   ARRAY(SELECT v.id || ':' || v.video FROM blog_lecturevideo v
+                         WHERE v.blog_post_id = b.id ORDER BY v.id) AS videos
+            FROM blog_blog b JOIN blog_blog_translation t ON t.master_id = b.id
+            WHERE b.id = %s
+        """, (palestra_id,))
+
+
+def test_failed_child_write_rolls_back_the_whole_update(db_client, editor):
+    new_id = db_client.post('/api/conteudos/palestras', json=PALESTRA).get_json()['id']
+    try:
+        before = palestra_rows(new_id)
+        # O DELETE dos vídeos roda; o INSERT estoura o varchar(500) no mesmo statement
+        changed = dict(PALESTRA, title='Alterado', speaker='Beltrana', videos=['ok', 'x' * 501])
+        response = db_client.put(f'/api/conteudos/palestras/{new_id}', json=changed)
+        assert response.status_code == 500
+        assert palestra_rows(new_id) == before
+    finally:
+        db_client.delete(f'/api/conteudos/palestras/{new_id}')
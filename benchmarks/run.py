@@ -0,0 +1,273 @@
+"""Carga nas rotas quentes da API com latência p50/p95/p99 e req/s em JSON.
+
+Cada cenário roda por --duration segundos com --concurrency threads, depois
+de --warmup segundos descartados. O resultado é comparado com um baseline
+gravado (--save-baseline) e, com --fail-on-regression, sai com código 1 se
+algum cenário piorar além de --tolerance.
+
+    python benchmarks/run.py --base-url http://127.0.0.1:5000 --concurrency 16
+    python benchmarks/run.py --scenarios palestras_deep,stats --output out.json
+    BENCH_EDITOR_USER=... BENCH_EDITOR_PASSWORD=... python benchmarks/run.py --scenarios editor_write
+
+O servidor precisa estar com o rate limit desligado (RATELIMIT_ENABLED=0).
+"""
+import argparse
+import gzip
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from http.cookiejar import CookieJar
+from pathlib import Path
+
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+
+
+class Client:
+    """Cliente HTTP de uma thread (cookies próprios, para a sessão do editor)"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        req.add_header('Accept-Encoding', 'gzip')
+        if data is not None:
+            req.add_header('Content-Type', 'application/json')
+            req.add_header('Origin', self.base_url)
+        try:
+            with self.opener.open(req, timeout=30) as resp:
+                return resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def json(self, path):
+        status, body = self.request('GET', path)
+        if status != 200:
+            raise RuntimeError(f"GET {path} -> {status}")
+        if body[:2] == b'\x1f\x8b':
+            body = gzip.decompress(body)
+        return json.loads(body)
+
+
+def discover(client):
+    """Ids e totais reais do servidor, usados para montar as requisições"""
+    palestras = client.json('/api/palestras?per_page=100&fields=id')
+    exercicios = client.json('/api/conteudos/exercicios?per_page=100&fields=id')
+    estudos = client.json('/api/conteudos/estudos?per_page=100&fields=id')
+    return {
+        'palestra_pages': max(1, math.ceil(palestras['total'] / 12)),
+        'palestra_ids': [p['id'] for p in palestras['palestras']],
+        'exercicio_ids': [e['id'] for e in exercicios['exercicios']],
+        'estudo_ids': [e['id'] for e in estudos['estudos']],
+    }
+
+
+# Cenário -> função(client, rng, info) que faz uma operação e retorna o status HTTP
+def palestras_deep(client, rng, info):
+    # Metade final das páginas: o caso caro do OFFSET
+    pages = info['palestra_pages']
+    return client.request('GET', f"/api/palestras?page={rng.randint(pages // 2 + 1, pages)}&per_page=12")[0]
+
+
+def palestras_cursor(client, rng, info):
+    # Primeira página por keyset, para comparar com o OFFSET profundo
+    return client.request('GET', '/api/palestras?cursor=&per_page=12')[0]
+
+
+def latest_videos(client, rng, info):
+    return client.request('GET', '/api/latest-videos')[0]
+
+
+def stats(client, rng, info):
+    return client.request('GET', '/api/stats')[0]
+
+
+def palestra_detail(client, rng, info):
+    return client.request('GET', f"/api/palestras/{rng.choice(info['palestra_ids'])}")[0]
+
+
+def exercicio_detail(client, rng, info):
+    return client.request('GET', f"/api/conteudos/exercicios/{rng.choice(info['exercicio_ids'])}")[0]
+
+
+def estudo_detail(client, rng, info):
+    return client.request('GET', f"/api/conteudos/estudos/{rng.choice(info['estudo_ids'])}")[0]
+
+
+def editor_write(client, rng, info):
+    # Cria e remove um exercício marcado: exercita escrita + invalidação de cache sem deixar lixo
+    status, body = client.request('POST', '/api/conteudos/exercicios', {
+        'title': f"bench {rng.random()}", 'tags': ['__bench__'], 'body': 'x' * 2000,
+    })
+    if status != 201:
+        return status
+    return client.request('DELETE', f"/api/conteudos/exercicios/{json.loads(body)['id']}")[0]
+
+
+SCENARIOS = {f.__name__: f for f in (
+    palestras_deep, palestras_cursor, latest_videos, stats,
+    palestra_detail, exercicio_detail, estudo_detail, editor_write,
+)}
+READ_SCENARIOS = [name for name in SCENARIOS if name != 'editor_write']
+
+
+def login(client):
+    user, password = os.environ.get('BENCH_EDITOR_USER'), os.environ.get('BENCH_EDITOR_PASSWORD')
+    if not user or not password:
+        raise SystemExit("editor_write precisa de BENCH_EDITOR_USER e BENCH_EDITOR_PASSWORD")
+    status, _ = client.request('POST', '/api/auth/login', {'username': user, 'password': password})
+    if status != 200:
+        raise SystemExit(f"login do editor falhou ({status})")
+
+
+def percentile(sorted_values, p):
+    """Percentil por nearest-rank"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def to_ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def run_scenario(name, args, info):
+    scenario = SCENARIOS[name]
+    latencies, errors, lock = [], {}, threading.Lock()
+    warmup_until = time.monotonic() + args.warmup
+    stop_at = warmup_until + args.duration
+
+    def worker(seed):
+        client = Client(args.base_url)
+        if name == 'editor_write':
+            login(client)
+        rng = random.Random(seed)
+        local_latencies, local_errors = [], {}
+        while True:
+            start = time.monotonic()
+            if start >= stop_at:
+                break
+            status = scenario(client, rng, info)
+            elapsed = time.monotonic() - start
+            if start < warmup_until:
+                continue
+            if 200 <= status < 300:
+                local_latencies.append(elapsed)
+            else:
+                local_errors[status] = local_errors.get(status, 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_errors.items():
+                errors[status] = errors.get(status, 0) + count
+
+    threads = [threading.Thread(target=worker, args=(args.seed + i,)) for i in range(args.concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': {str(k): v for k, v in sorted(errors.items())},
+        'rps': round(len(latencies) / args.duration, 2),
+        'p50_ms': to_ms(percentile(latencies, 50)),
+        'p95_ms': to_ms(percentile(latencies, 95)),
+        'p99_ms': to_ms(percentile(latencies, 99)),
+        'mean_ms': to_ms(sum(latencies) / len(latencies)) if latencies else None,
+        'max_ms': to_ms(latencies[-1]) if latencies else None,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regressões: p95 acima ou req/s abaixo do baseline além da tolerância"""
+    regressions = []
+    for name, current in results['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if not base or not current['requests']:
+            continue
+        current['baseline'] = {'p95_ms': base['p95_ms'], 'rps': base['rps']}
+        if base['p95_ms'] and current['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+        if base['rps'] and current['rps'] < base['rps'] * (1 - tolerance):
+            regressions.append(f"{name}: req/s {base['rps']} -> {current['rps']}")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=os.environ.get('BENCH_BASE_URL', 'http://127.0.0.1:5000'))
+    parser.add_argument('--scenarios', default=','.join(READ_SCENARIOS),
+                        help=f"lista separada por vírgula (disponíveis: {', '.join(SCENARIOS)})")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20, help='segundos medidos por cenário')
+    parser.add_argument('--warmup', type=float, default=3, help='segundos descartados por cenário')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='grava o resultado JSON neste arquivo (padrão: stdout)')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--save-baseline', action='store_true', help='grava o resultado como novo baseline')
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.scenarios.split(',') if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"cenários desconhecidos: {', '.join(unknown)}")
+
+    info = discover(Client(args.base_url))
+    results = {
+        'meta': {
+            'base_url': args.base_url,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'git_revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+        },
+        'scenarios': {},
+    }
+    for name in names:
+        print(f"{name}...", file=sys.stderr)
+        results['scenarios'][name] = run_scenario(name, args, info)
+
+    regressions = []
+    baseline_path = Path(args.baseline)
+    if baseline_path.is_file() and not args.save_baseline:
+        regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+        results['regressions'] = regressions
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+    else:
+        print(output)
+    if args.save_baseline:
+        baseline_path.write_text(output + '\n')
+        print(f"baseline gravado em {baseline_path}", file=sys.stderr)
+
+    for line in regressions:
+        print(f"REGRESSÃO {line}", file=sys.stderr)
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
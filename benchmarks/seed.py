@@ -0,0 +1,152 @@
+"""Gera um dataset sintético escalado a partir dos dados atuais (init.sql).
+
+Cada palestra (com tradução pt-br, vídeos e arquivos), exercício e estudo
+original é copiado `scale - 1` vezes, com datas deslocadas para espalhar as
+cópias no tempo. As cópias ficam marcadas (slug `bench-...` / tag `__bench__`)
+e são removidas com --reset.
+
+    python benchmarks/seed.py --scale 10
+    python benchmarks/seed.py --reset
+
+Usa as mesmas variáveis DB_* do backend.
+"""
+import argparse
+import os
+import sys
+import time
+
+import psycopg2
+
+BENCH_TAG = '__bench__'
+
+SEED_PALESTRAS = """
+    WITH src AS (
+        SELECT b.*, t.title, t.body, t.date_time, t.resume_speaker, t.affiliation, g.n
+        FROM blog_blog b
+        JOIN blog_blog_translation t ON t.master_id = b.id AND t.language_code = 'pt-br'
+        CROSS JOIN generate_series(1, %(copies)s) AS g(n)
+        WHERE b.slug IS NULL OR b.slug NOT LIKE 'bench-%%'
+    ), new_blog AS (
+        INSERT INTO blog_blog (speaker, speaker_display, moderator, slug, image, publish, banner,
+                               posted, subcategory)
+        SELECT speaker, speaker_display, moderator, 'bench-' || n || '-' || id, image, publish, banner,
+               posted - n * 7, subcategory
+        FROM src
+        RETURNING id, slug
+    ), new_translation AS (
+        INSERT INTO blog_blog_translation (language_code, title, body, date_time, resume_speaker,
+                                           master_id, affiliation)
+        SELECT 'pt-br', src.title, src.body, src.date_time - src.n * interval '7 days',
+               src.resume_speaker, new_blog.id, src.affiliation
+        FROM new_blog JOIN src ON new_blog.slug = 'bench-' || src.n || '-' || src.id
+    ), new_videos AS (
+        INSERT INTO blog_lecturevideo (video, blog_post_id)
+        SELECT v.video, new_blog.id
+        FROM new_blog
+        JOIN src ON new_blog.slug = 'bench-' || src.n || '-' || src.id
+        JOIN blog_lecturevideo v ON v.blog_post_id = src.id
+    ), new_files AS (
+        INSERT INTO blog_lecturefile (file, blog_post_id)
+        SELECT f.file, new_blog.id
+        FROM new_blog
+        JOIN src ON new_blog.slug = 'bench-' || src.n || '-' || src.id
+        JOIN blog_lecturefile f ON f.blog_post_id = src.id
+    )
+    SELECT COUNT(*) FROM new_blog
+"""
+
+SEED_EXERCICIOS = """
+    WITH new_rows AS (
+        INSERT INTO exercicios (mockup, title, description, instructor, duration_minutes,
+            difficulty_level, category, subcategory, video_url, thumbnail, published_date,
+            tags, equipment_needed, body)
+        SELECT mockup, title, description, instructor, duration_minutes, difficulty_level,
+               category, subcategory, video_url, thumbnail, published_date - g.n * interval '7 days',
+               array_append(tags, %(tag)s), equipment_needed, body
+        FROM exercicios CROSS JOIN generate_series(1, %(copies)s) AS g(n)
+        WHERE NOT %(tag)s = ANY(tags)
+        RETURNING id
+    )
+    SELECT COUNT(*) FROM new_rows
+"""
+
+SEED_ESTUDOS = """
+    WITH new_rows AS (
+        INSERT INTO estudos (mockup, title, description, author, content_type, published_date,
+            category, tags, body, external_link, pdf_file, reading_time_minutes)
+        SELECT mockup, title, description, author, content_type,
+               published_date - g.n * interval '7 days', category, array_append(tags, %(tag)s),
+               body, external_link, pdf_file, reading_time_minutes
+        FROM estudos CROSS JOIN generate_series(1, %(copies)s) AS g(n)
+        WHERE NOT %(tag)s = ANY(tags)
+        RETURNING id
+    )
+    SELECT COUNT(*) FROM new_rows
+"""
+
+RESET = """
+    DELETE FROM blog_lecturevideo WHERE blog_post_id IN (SELECT id FROM blog_blog WHERE slug LIKE 'bench-%%');
+    DELETE FROM blog_lecturefile WHERE blog_post_id IN (SELECT id FROM blog_blog WHERE slug LIKE 'bench-%%');
+    DELETE FROM blog_blog_translation WHERE master_id IN (SELECT id FROM blog_blog WHERE slug LIKE 'bench-%%');
+    DELETE FROM blog_blog WHERE slug LIKE 'bench-%%';
+    DELETE FROM exercicios WHERE %(tag)s = ANY(tags);
+    DELETE FROM estudos WHERE %(tag)s = ANY(tags);
+"""
+
+# O mesmo que invalidate_tags() no backend: workers em execução descartam o cache
+INVALIDATE = """
+    INSERT INTO content_versions (kind, version, updated_at)
+    SELECT unnest(%(kinds)s::text[]), 1, now()
+    ON CONFLICT (kind) DO UPDATE SET version = content_versions.version + 1, updated_at = now();
+    SELECT pg_notify(%(channel)s, %(tags)s);
+"""
+
+KINDS = ['palestras', 'cartilhas', 'exercicios', 'estudos', 'stats']
+
+
+def connect():
+    config = {
+        'dbname': os.environ.get('DB_NAME', 'amparoapp'),
+        'user': os.environ.get('DB_USER', 'admin_amparo'),
+        'host': os.environ.get('DB_HOST', 'localhost'),
+        'port': int(os.environ.get('DB_PORT', 5432)),
+    }
+    if os.environ.get('DB_PASSWORD'):
+        config['password'] = os.environ['DB_PASSWORD']
+    return psycopg2.connect(**config)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=10,
+                        help='tamanho final em múltiplos dos dados originais (padrão: 10)')
+    parser.add_argument('--reset', action='store_true', help='remove as cópias sintéticas e sai')
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error('--scale deve ser >= 1')
+
+    conn = connect()
+    start = time.perf_counter()
+    with conn, conn.cursor() as cur:
+        cur.execute(RESET, {'tag': BENCH_TAG})
+        if not args.reset:
+            copies = args.scale - 1
+            for name, sql in (('palestras', SEED_PALESTRAS), ('exercicios', SEED_EXERCICIOS),
+                              ('estudos', SEED_ESTUDOS)):
+                cur.execute(sql, {'copies': copies, 'tag': BENCH_TAG})
+                print(f"{name}: +{cur.fetchone()[0]} linhas", file=sys.stderr)
+        cur.execute(INVALIDATE, {'kinds': KINDS, 'tags': ','.join(KINDS),
+                                 'channel': os.environ.get('CACHE_NOTIFY_CHANNEL', 'amparo_cache')})
+
+    # Fora da transação: a view é atualizada e as estatísticas do planner refletem o volume novo
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("REFRESH MATERIALIZED VIEW content_stats")
+        cur.execute("ANALYZE blog_blog, blog_blog_translation, blog_lecturevideo, blog_lecturefile, "
+                    "exercicios, estudos")
+    conn.close()
+    print(f"pronto em {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
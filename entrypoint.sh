@@ -25,11 +25,20 @@ else:
     exit(1)
 "
 
+if [ "${DB_AUTO_MIGRATE:-1}" = "1" ]; then
+    echo "Applying database migrations..."
+    flask --app app migrate
+    flask --app app backfill-speakers
+fi
+
+# GUNICORN_THREADS > 1 usa workers gthread: uma query lenta prende só uma
+# thread, não o worker inteiro (DB_POOL_MAX deve acompanhar o número de threads)
 echo "Starting gunicorn..."
 exec gunicorn \
     --bind 0.0.0.0:5000 \
     --workers "${GUNICORN_WORKERS:-2}" \
-    --timeout 120 \
+    --threads "${GUNICORN_THREADS:-1}" \
+    --timeout "${GUNICORN_TIMEOUT:-120}" \
     --access-logfile - \
     --error-logfile - \
     app:app
@@ -39,7 +39,7 @@ export function Blog() {
     setLoading(true);
     // Carrega todas as palestras para permitir busca client-side
     const subcategoryQuery = activeSubcategory !== 'all' ? `&subcategory=${activeSubcategory}` : '';
-    fetch(`${API_ENDPOINTS.palestras}?page=1&per_page=100${subcategoryQuery}`)
+    fetch(`${API_ENDPOINTS.palestras}?page=1&per_page=100&fields=id,title,date_time,speaker,affiliation,videos${subcategoryQuery}`)
       .then(res => res.json())
       .then(responseData => {
         setData(responseData);
@@ -17,7 +17,7 @@ export function CartilhasList() {
 
   useEffect(() => {
     setLoading(true);
-    fetch(`${API_ENDPOINTS.conteudos.cartilhas}?page=1&per_page=100`)
+    fetch(`${API_ENDPOINTS.conteudos.cartilhas}?page=1&per_page=100&fields=id,title,pdf_file,published_date,speaker,affiliation`)
       .then(res => res.json())
       .then(responseData => {
         setData(responseData);
@@ -17,7 +17,7 @@ export function EstudosList() {
 
   useEffect(() => {
     setLoading(true);
-    fetch(`${API_ENDPOINTS.conteudos.estudos}?page=1&per_page=100`)
+    fetch(`${API_ENDPOINTS.conteudos.estudos}?page=1&per_page=100&fields=id,title,description,author,content_type,category,tags,published_date,reading_time_minutes,mockup`)
       .then(res => res.json())
       .then(responseData => {
         setData(responseData);
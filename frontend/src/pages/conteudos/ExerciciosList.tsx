@@ -20,7 +20,7 @@ export function ExerciciosList() {
   useEffect(() => {
     setLoading(true);
     const subcategoryQuery = activeSubcategory !== 'all' ? `&subcategory=${activeSubcategory}` : '';
-    fetch(`${API_ENDPOINTS.conteudos.exercicios}?page=1&per_page=100${subcategoryQuery}`)
+    fetch(`${API_ENDPOINTS.conteudos.exercicios}?page=1&per_page=100&fields=id,title,description,instructor,duration_minutes,difficulty_level,category,subcategory,published_date,mockup${subcategoryQuery}`)
       .then(res => res.json())
       .then(responseData => {
         setData(responseData);
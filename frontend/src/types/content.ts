@@ -17,6 +17,12 @@ export interface Video {
   blog_post_id?: number;
 }
 
+export interface LectureFile {
+  id: number;
+  file: string;
+  blog_post_id?: number;
+}
+
 // Palestra
 export interface Palestra extends BaseContent {
   slug: string;
@@ -64,6 +70,7 @@ export interface Cartilha extends BaseContent {
   speaker: string;
   affiliation: string;
   resume_speaker?: string;
+  files?: LectureFile[];
 }
 
 // Resposta paginada genérica